@@ -6,15 +6,36 @@ API客户端适配器 - 提供统一的API调用接口
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Dict, Optional, Any
-import json
+import threading
+from typing import Dict, Optional, Any, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.logger import get_logger
+from utils.json_utils import fast_loads, fast_dumps
+from .http_cache import HTTPResponseCache, CACHEABLE_METHODS
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# 默认重试策略，Retry对象不可变，可在实例间共享
+RETRY_STATUS_FORCELIST = frozenset({429, 500, 502, 503, 504})
+_DEFAULT_RETRY = Retry(total=3, backoff_factor=1, status_forcelist=RETRY_STATUS_FORCELIST)
+
+# 视为请求失败的异常类型
+_HTTP_ERRORS = (requests.exceptions.RequestException,)
+if httpx is not None:
+    _HTTP_ERRORS += (httpx.HTTPError,)
 
 
 class APIClient:
@@ -35,9 +56,35 @@ class APIClient:
         self.max_retries = self.config.get('max_retries', 3)
         self.retry_delay = self.config.get('retry_delay', 1)
         
+        # HTTP/2（需要安装 httpx[http2]），同一主机的并发请求复用单个TLS连接
+        self.http2 = bool(self.config.get('http2', False))
+        if self.http2 and httpx is None:
+            self.logger.warning("未安装httpx，HTTP/2不可用，回退到requests")
+            self.http2 = False
+        
+        # 响应缓存（http_cache_ttl > 0 时启用）
+        self.http_cache = None
+        http_cache_ttl = self.config.get('http_cache_ttl', 0)
+        if http_cache_ttl > 0:
+            self.http_cache = HTTPResponseCache(
+                self.config.get('http_cache_dir', '.http_cache'),
+                ttl=http_cache_ttl
+            )
+        
+        # 条件请求（ETag / Last-Modified），按URL记录GET响应的校验器和最近一次的响应，
+        # 未变化的接口只返回304（GitHub的304响应不计入速率限制）
+        self.conditional_get = self.config.get('conditional_get', True)
+        self.conditional_cache_size = self.config.get('conditional_cache_size', 256)
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._validated_responses: 'OrderedDict[str, Any]' = OrderedDict()
+        self._validators_lock = threading.Lock()
+        
         # 创建会话
-        self.session = requests.Session()
-        self._setup_session()
+        if self.http2:
+            self.session = self._create_http2_session()
+        else:
+            self.session = requests.Session()
+            self._setup_session()
         
         # 统计信息
         self.request_count = 0
@@ -51,22 +98,48 @@ class APIClient:
             'User-Agent': 'MacSoftwareVersionTracker/1.0',
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive',
         })
         
-        # 设置重试策略
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
+        # 设置重试策略（未覆盖默认值时复用模块级实例）
+        if self.max_retries == _DEFAULT_RETRY.total:
+            retry_strategy = _DEFAULT_RETRY
+        else:
+            retry_strategy = Retry(
+                total=self.max_retries,
+                backoff_factor=1,
+                status_forcelist=RETRY_STATUS_FORCELIST,
+            )
         
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+        adapter = HTTPAdapter(
+            pool_connections=self.config.get('pool_connections', 32),
+            pool_maxsize=self.config.get('pool_maxsize', 64),
+            pool_block=False,
+            max_retries=retry_strategy
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
     
+    def _create_http2_session(self) -> 'httpx.Client':
+        """创建支持HTTP/2的httpx会话"""
+        # httpx的传输层重试只覆盖连接错误，不按状态码重试
+        transport = httpx.HTTPTransport(http2=True, retries=self.max_retries)
+        return httpx.Client(
+            http2=True,
+            transport=transport,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.config.get('pool_maxsize', 64),
+                max_keepalive_connections=self.config.get('pool_connections', 32),
+            ),
+            headers={
+                'User-Agent': 'MacSoftwareVersionTracker/1.0',
+                'Accept': 'application/json, text/plain, */*',
+                'Accept-Language': 'en-US,en;q=0.9',
+            },
+        )
+    
     def get(self, url: str, **kwargs) -> Optional[requests.Response]:
         """
         发送GET请求
@@ -133,22 +206,67 @@ class APIClient:
         """
         self.request_count += 1
         
+        # 幂等请求优先读取响应缓存
+        cache_key = None
+        if self.http_cache and method.upper() in CACHEABLE_METHODS:
+            cache_key = self.http_cache.make_key(method, url, kwargs.get('params'))
+            cached_response = self.http_cache.get_response(cache_key)
+            if cached_response is not None:
+                self.success_count += 1
+                self.logger.debug("API缓存命中: %s %s", method, url)
+                return cached_response
+        
         try:
             # 设置超时
             kwargs.setdefault('timeout', self.timeout)
             
+            # httpx以content参数发送原始字节
+            if self.http2 and isinstance(kwargs.get('data'), (bytes, str)):
+                kwargs['content'] = kwargs.pop('data')
+            
+            # GET请求附加条件请求头
+            validator_key = None
+            conditional_headers = {}
+            if self.conditional_get and method.upper() == 'GET':
+                validator_key = HTTPResponseCache.make_key('GET', url, kwargs.get('params'), namespace='validator')
+                conditional_headers = self._conditional_headers(validator_key)
+            request_headers = kwargs.get('headers')
+            if conditional_headers:
+                kwargs['headers'] = {**(request_headers or {}), **conditional_headers}
+            
             # 发送请求
-            self.logger.debug(f"API请求: {method} {url}")
+            self.logger.debug("API请求: %s %s", method, url)
             response = self.session.request(method, url, **kwargs)
+            
+            # 304需在raise_for_status之前处理（httpx对3xx同样抛出异常）
+            if response.status_code == 304 and conditional_headers:
+                cached_response = self._validated_response(validator_key)
+                if cached_response is not None:
+                    self.success_count += 1
+                    self.logger.debug("API未修改，使用本地副本: %s", url)
+                    return cached_response
+                
+                # 本地副本已被淘汰，去掉条件头重新请求
+                kwargs['headers'] = request_headers
+                response = self.session.request(method, url, **kwargs)
+            
             response.raise_for_status()
             
+            if cache_key:
+                self.http_cache.set_response(cache_key, response)
+            
+            if validator_key:
+                self._remember_validators(validator_key, response)
+            
             self.success_count += 1
-            self.logger.debug(f"API请求成功: {method} {url} (状态码: {response.status_code})")
+            self.logger.debug("API请求成功: %s %s (状态码: %s)", method, url, response.status_code)
             
             return response
             
-        except requests.exceptions.RequestException as e:
+        except _HTTP_ERRORS as e:
             self.failure_count += 1
+            if cache_key:
+                self.http_cache.delete(cache_key)
             self.logger.error(f"API请求失败: {method} {url} - {str(e)}")
             return None
         except Exception as e:
@@ -156,6 +274,48 @@ class APIClient:
             self.logger.error(f"API请求异常: {method} {url} - {str(e)}")
             return None
     
+    def _conditional_headers(self, validator_key: str) -> Dict:
+        """根据已记录的校验器构建条件请求头"""
+        with self._validators_lock:
+            validators = self._validators.get(validator_key)
+            if not validators or validator_key not in self._validated_responses:
+                return {}
+        
+        etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def _validated_response(self, validator_key: str):
+        """取出校验器对应的本地副本，已被淘汰时清除校验器并返回None"""
+        with self._validators_lock:
+            response = self._validated_responses.get(validator_key)
+            if response is None:
+                self._validators.pop(validator_key, None)
+                return None
+            self._validated_responses.move_to_end(validator_key)
+            return response
+    
+    def _remember_validators(self, validator_key: str, response):
+        """记录响应的ETag/Last-Modified及响应本身，供后续条件请求使用"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        with self._validators_lock:
+            self._validators[validator_key] = (etag, last_modified)
+            self._validated_responses[validator_key] = response
+            self._validated_responses.move_to_end(validator_key)
+            
+            # 超出容量时淘汰最久未使用的副本
+            while len(self._validated_responses) > self.conditional_cache_size:
+                evicted_key, _ = self._validated_responses.popitem(last=False)
+                self._validators.pop(evicted_key, None)
+    
     def get_json(self, url: str, **kwargs) -> Optional[Dict]:
         """
         获取JSON数据
@@ -167,15 +327,64 @@ class APIClient:
         Returns:
             Optional[Dict]: JSON数据
         """
+        # 缓存解码后的数据，命中时跳过JSON解析
+        json_key = None
+        if self.http_cache:
+            json_key = self.http_cache.make_key('GET', url, kwargs.get('params'), namespace='json')
+            cached_data = self.http_cache.get(json_key)
+            if cached_data is not None:
+                return cached_data
+        
         response = self.get(url, **kwargs)
         if not response:
             return None
         
         try:
-            return response.json()
+            data = fast_loads(response.content)
         except Exception as e:
             self.logger.error(f"解析JSON失败: {url} - {str(e)}")
             return None
+        
+        if json_key:
+            self.http_cache.set(json_key, data)
+        return data
+    
+    def batch_get_json(self, urls: List[str], concurrency: int = 32,
+                       total_timeout: float = 60, **kwargs) -> List[Optional[Dict]]:
+        """
+        并发获取多个JSON接口
+        
+        Args:
+            urls: 请求URL列表
+            concurrency: 最大并发数
+            total_timeout: 整批请求的总超时时间（秒）
+            **kwargs: 额外的请求参数
+            
+        Returns:
+            List[Optional[Dict]]: 与urls顺序一致的JSON数据，失败或超时项为None
+        """
+        if not urls:
+            return []
+        
+        results: List[Optional[Dict]] = [None] * len(urls)
+        executor = ThreadPoolExecutor(max_workers=min(concurrency, len(urls)))
+        
+        try:
+            future_to_index = {
+                executor.submit(self.get_json, url, **kwargs): index
+                for index, url in enumerate(urls)
+            }
+            done, not_done = wait(future_to_index, timeout=total_timeout)
+            
+            for future in done:
+                results[future_to_index[future]] = future.result()
+            
+            if not_done:
+                self.logger.warning(f"批量JSON请求超时: {len(not_done)}/{len(urls)} 个请求未完成")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return results
     
     def post_json(self, url: str, data: Dict, **kwargs) -> Optional[Dict]:
         """
@@ -193,14 +402,14 @@ class APIClient:
         headers = kwargs.get('headers', {})
         headers['Content-Type'] = 'application/json'
         kwargs['headers'] = headers
-        kwargs['data'] = json.dumps(data)
+        kwargs['data'] = fast_dumps(data)
         
         response = self.post(url, **kwargs)
         if not response:
             return None
         
         try:
-            return response.json()
+            return fast_loads(response.content)
         except Exception as e:
             self.logger.error(f"解析JSON响应失败: {url} - {str(e)}")
             return None
@@ -221,6 +430,23 @@ class APIClient:
         except:
             return False
     
+    def check_many(self, urls: List[str], workers: int = 16) -> Dict[str, bool]:
+        """
+        并发检查多个URL是否可用
+        
+        Args:
+            urls: URL列表
+            workers: 并发线程数
+            
+        Returns:
+            Dict[str, bool]: URL到可用性的映射
+        """
+        if not urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(self.check_api_availability, urls)))
+    
     def set_auth_token(self, token: str, token_type: str = 'Bearer'):
         """
         设置认证令牌
@@ -251,12 +477,17 @@ class APIClient:
         total_requests = self.request_count
         success_rate = (self.success_count / total_requests * 100) if total_requests > 0 else 0
         
-        return {
+        stats = {
             'total_requests': total_requests,
             'success_count': self.success_count,
             'failure_count': self.failure_count,
             'success_rate': round(success_rate, 2)
         }
+        
+        if self.http_cache:
+            stats['http_cache'] = self.http_cache.get_stats()
+        
+        return stats
     
     def reset_stats(self):
         """重置统计信息"""
@@ -268,6 +499,8 @@ class APIClient:
         """关闭会话"""
         if self.session:
             self.session.close()
+        if self.http_cache:
+            self.http_cache.close()
     
     def __enter__(self):
         return self
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异步网页爬虫适配器 - 基于aiohttp提供并发网页爬取接口
+"""
+
+import asyncio
+import random
+from typing import Dict, Optional, List, Union
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from utils.logger import get_logger
+
+
+class AsyncWebScraper:
+    """异步网页爬虫适配器"""
+
+    def __init__(self, config: Dict = None):
+        """
+        初始化异步网页爬虫
+
+        Args:
+            config: 配置字典
+        """
+        self.config = config or {}
+        self.logger = get_logger(__name__)
+
+        # 基础配置
+        self.timeout = self.config.get('timeout', 30)
+        self.concurrency = self.config.get('concurrency', 100)
+        self.dns_cache_ttl = self.config.get('dns_cache_ttl', 300)
+
+        # User-Agent池
+        self.user_agents = self.config.get('user_agents', [
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+        ])
+
+        # 会话在事件循环内延迟创建
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # 统计信息
+        self.request_count = 0
+        self.success_count = 0
+        self.failure_count = 0
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """创建aiohttp会话"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=self.dns_cache_ttl)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+                'DNT': '1',
+                'Upgrade-Insecure-Requests': '1',
+            },
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取会话实例"""
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        return self.session
+
+    async def fetch_page(self, url: str, **kwargs) -> Optional[str]:
+        """
+        异步获取页面内容
+
+        Args:
+            url: 目标URL
+            **kwargs: 额外的请求参数
+
+        Returns:
+            Optional[str]: 页面文本
+        """
+        self.request_count += 1
+
+        try:
+            # 复制一份，fetch_many传入的同一个headers字典在多个请求间共享
+            headers = dict(kwargs.pop('headers', None) or {})
+            if 'User-Agent' not in headers:
+                headers['User-Agent'] = random.choice(self.user_agents)
+
+            self.logger.debug("异步请求页面: %s", url)
+            async with self._get_session().get(url, headers=headers, **kwargs) as response:
+                response.raise_for_status()
+                text = await response.text(errors='replace')
+
+            self.success_count += 1
+            self.logger.debug("成功获取页面: %s (状态码: %s)", url, response.status)
+            return text
+
+        except aiohttp.ClientError as e:
+            self.failure_count += 1
+            self.logger.error(f"请求失败: {url} - {str(e)}")
+            return None
+        except Exception as e:
+            self.failure_count += 1
+            self.logger.error(f"未知错误: {url} - {str(e)}")
+            return None
+
+    async def fetch_soup(self, url: str, parser: str = 'lxml', **kwargs) -> Optional[BeautifulSoup]:
+        """
+        异步获取BeautifulSoup对象
+
+        Args:
+            url: 目标URL
+            parser: 解析器类型
+            **kwargs: 额外的请求参数
+
+        Returns:
+            Optional[BeautifulSoup]: BeautifulSoup对象
+        """
+        text = await self.fetch_page(url, **kwargs)
+        if text is None:
+            return None
+
+        try:
+            return BeautifulSoup(text, parser)
+        except Exception as e:
+            self.logger.error(f"解析HTML失败: {url} - {str(e)}")
+            return None
+
+    async def fetch_json(self, url: str, **kwargs) -> Optional[Dict]:
+        """
+        异步获取JSON数据
+
+        Args:
+            url: 目标URL
+            **kwargs: 额外的请求参数
+
+        Returns:
+            Optional[Dict]: JSON数据
+        """
+        self.request_count += 1
+
+        try:
+            async with self._get_session().get(url, **kwargs) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+
+            self.success_count += 1
+            return data
+
+        except Exception as e:
+            self.failure_count += 1
+            self.logger.error(f"获取JSON失败: {url} - {str(e)}")
+            return None
+
+    async def download_file(self, url: str, local_path: str, chunk_size: int = 65536) -> bool:
+        """
+        异步下载文件
+
+        Args:
+            url: 文件URL
+            local_path: 本地保存路径
+            chunk_size: 块大小
+
+        Returns:
+            bool: 是否成功
+        """
+        import aiofiles
+
+        try:
+            self.logger.info(f"开始下载文件: {url}")
+
+            async with self._get_session().get(url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(local_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await f.write(chunk)
+
+            self.logger.info(f"文件下载完成: {local_path}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"文件下载失败: {url} - {str(e)}")
+            return False
+
+    async def fetch_many(self, urls: List[str], **kwargs) -> List[Union[Optional[str], BaseException]]:
+        """
+        并发获取多个页面
+
+        Args:
+            urls: URL列表
+            **kwargs: 额外的请求参数
+
+        Returns:
+            List[Union[Optional[str], BaseException]]: 与urls顺序一致的页面文本或异常
+        """
+        return await asyncio.gather(
+            *[self.fetch_page(url, **kwargs) for url in urls],
+            return_exceptions=True
+        )
+
+    def get_pages(self, urls: List[str], **kwargs) -> List[Optional[str]]:
+        """
+        同步方式并发获取多个页面
+
+        Args:
+            urls: URL列表
+            **kwargs: 额外的请求参数
+
+        Returns:
+            List[Optional[str]]: 与urls顺序一致的页面文本，失败项为None
+        """
+        async def _run():
+            try:
+                return await self.fetch_many(urls, **kwargs)
+            finally:
+                await self.close()
+
+        results = asyncio.run(_run())
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    def get_stats(self) -> Dict:
+        """
+        获取统计信息
+
+        Returns:
+            Dict: 统计信息
+        """
+        total_requests = self.request_count
+        success_rate = (self.success_count / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            'total_requests': total_requests,
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'success_rate': round(success_rate, 2)
+        }
+
+    def reset_stats(self):
+        """重置统计信息"""
+        self.request_count = 0
+        self.success_count = 0
+        self.failure_count = 0
+
+    async def close(self):
+        """关闭会话"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP响应缓存 - 基于diskcache的请求结果缓存
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# 可缓存的幂等请求方法
+CACHEABLE_METHODS = frozenset({'GET', 'HEAD'})
+
+
+class HTTPResponseCache:
+    """HTTP响应磁盘缓存"""
+
+    def __init__(self, cache_dir: str = '.http_cache', ttl: int = 300, size_limit: int = int(1e9)):
+        """
+        初始化响应缓存
+
+        Args:
+            cache_dir: 缓存目录
+            ttl: 默认生存时间（秒）
+            size_limit: 缓存目录大小上限（字节）
+        """
+        from diskcache import Cache
+
+        self.ttl = ttl
+        self.cache = Cache(cache_dir, size_limit=size_limit)
+        self.cache.stats(enable=True)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None, namespace: str = 'response') -> str:
+        """
+        生成缓存键
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            params: 查询参数
+            namespace: 键命名空间，用于区分原始响应和解码后的数据
+
+        Returns:
+            str: 缓存键
+        """
+        params_repr = sorted(params.items()) if isinstance(params, dict) else params
+        raw = f"{namespace}|{method.upper()}|{url}|{params_repr}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get_response(self, key: str) -> Optional[requests.Response]:
+        """
+        获取缓存的响应对象
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[requests.Response]: 重建的响应对象
+        """
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+
+        status_code, headers, content, url, encoding = cached
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.url = url
+        response.encoding = encoding
+        return response
+
+    def set_response(self, key: str, response: requests.Response, ttl: int = None) -> bool:
+        """
+        缓存响应对象
+
+        Args:
+            key: 缓存键
+            response: 响应对象
+            ttl: 生存时间（秒）
+
+        Returns:
+            bool: 是否成功
+        """
+        value = (response.status_code, dict(response.headers), response.content,
+                 str(response.url), response.encoding)
+        return self.cache.set(key, value, expire=ttl or self.ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        """获取缓存值"""
+        return self.cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        """设置缓存值"""
+        return self.cache.set(key, value, expire=ttl or self.ttl)
+
+    def delete(self, key: str) -> bool:
+        """删除缓存值"""
+        return self.cache.delete(key)
+
+    def clear(self) -> int:
+        """清空缓存"""
+        return self.cache.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            Dict: 统计信息
+        """
+        hits, misses = self.cache.stats()
+        return {
+            'hits': hits,
+            'misses': misses,
+            'size': len(self.cache),
+            'volume': self.cache.volume()
+        }
+
+    def close(self):
+        """关闭缓存"""
+        self.cache.close()
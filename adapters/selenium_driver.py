@@ -15,13 +15,34 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from typing import Dict, Optional, List
 import time
+import os
+import queue
+import threading
 
 from ..utils.logger import get_logger
 
 
+# Chrome内容设置，2表示禁止加载
+BLOCKED_CONTENT_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.stylesheets': 2,
+    'profile.managed_default_content_settings.fonts': 2,
+}
+
+# 通过CDP屏蔽的子资源URL模式
+BLOCKED_URL_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+)
+
+
 class SeleniumDriver:
     """Selenium浏览器驱动适配器"""
     
+    # 已解析的chromedriver路径，在所有实例间共享
+    _driver_path: Optional[str] = None
+    
     def __init__(self, config: Dict = None):
         """
         初始化Selenium驱动
@@ -40,12 +61,18 @@ class SeleniumDriver:
             '--no-sandbox',
             '--disable-dev-shm-usage',
             '--disable-gpu',
-            '--disable-images',
+            '--blink-settings=imagesEnabled=false',
         ])
+        # 屏蔽图片、样式、字体等子资源，版本检测只需要HTML和JSON
+        self.block_resources = self.config.get('block_resources', True)
+        self.blocked_url_patterns = self.config.get('blocked_url_patterns', BLOCKED_URL_PATTERNS)
+        # eager: driver.get在DOMContentLoaded后即返回，无需等待图片等子资源
+        self.page_load_strategy = self.config.get('page_load_strategy', 'eager')
         
         # 驱动实例
         self.driver = None
         self.wait = None
+        self._wait_cache: Dict[int, WebDriverWait] = {}
         
         # 统计信息
         self.page_load_count = 0
@@ -57,6 +84,7 @@ class SeleniumDriver:
         try:
             # 配置Chrome选项
             chrome_options = Options()
+            chrome_options.page_load_strategy = self.page_load_strategy
             
             if self.headless:
                 chrome_options.add_argument('--headless')
@@ -73,13 +101,21 @@ class SeleniumDriver:
             chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
+            if self.block_resources:
+                chrome_options.add_experimental_option('prefs', BLOCKED_CONTENT_PREFS)
+            
             # 创建服务
-            service = Service(ChromeDriverManager().install())
+            service = Service(self._resolve_driver_path())
             
             # 创建驱动
             driver = webdriver.Chrome(service=service, options=chrome_options)
             driver.set_page_load_timeout(self.timeout)
             
+            # 通过CDP在网络层拦截子资源请求
+            if self.block_resources and self.blocked_url_patterns:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(self.blocked_url_patterns)})
+            
             # 创建等待对象
             self.wait = WebDriverWait(driver, self.timeout)
             
@@ -90,6 +126,18 @@ class SeleniumDriver:
             self.logger.error(f"创建Chrome驱动失败: {str(e)}")
             raise
     
+    @classmethod
+    def _resolve_driver_path(cls) -> str:
+        """解析chromedriver路径，优先使用CHROMEDRIVER_PATH环境变量"""
+        if cls._driver_path is None:
+            cls._driver_path = os.environ.get('CHROMEDRIVER_PATH') or ChromeDriverManager().install()
+        return cls._driver_path
+    
+    @staticmethod
+    def _document_ready(driver) -> bool:
+        """判断文档是否已可交互"""
+        return driver.execute_script("return document.readyState") in ("interactive", "complete")
+    
     def get_driver(self) -> webdriver.Chrome:
         """获取驱动实例"""
         if self.driver is None:
@@ -111,19 +159,17 @@ class SeleniumDriver:
         try:
             driver = self.get_driver()
             
-            self.logger.debug(f"加载页面: {url}")
+            self.logger.debug("加载页面: %s", url)
             driver.get(url)
             
-            # 等待页面加载完成
+            # 等待文档可交互，而不是固定休眠
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # 等待一段时间让动态内容加载
-            time.sleep(2)
+            self.wait.until(self._document_ready)
             
             page_source = driver.page_source
             self.success_count += 1
             
-            self.logger.debug(f"页面加载成功: {url}")
+            self.logger.debug("页面加载成功: %s", url)
             return page_source
             
         except TimeoutException:
@@ -230,7 +276,10 @@ class SeleniumDriver:
         """
         try:
             wait_timeout = timeout or self.timeout
-            wait = WebDriverWait(self.get_driver(), wait_timeout)
+            wait = self._wait_cache.get(wait_timeout)
+            if wait is None:
+                wait = WebDriverWait(self.get_driver(), wait_timeout)
+                self._wait_cache[wait_timeout] = wait
             wait.until(EC.presence_of_element_located((by, selector)))
             return True
             
@@ -311,9 +360,177 @@ class SeleniumDriver:
             finally:
                 self.driver = None
                 self.wait = None
+                self._wait_cache.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SeleniumDriverPool:
+    """Selenium驱动池 - 预热多个浏览器实例供并发页面加载复用"""
+    
+    def __init__(self, size: int = 4, config: Dict = None):
+        """
+        初始化驱动池
+        
+        Args:
+            size: 驱动实例数量
+            config: 配置字典（与SeleniumDriver相同）
+        """
+        self.config = config or {}
+        self.logger = get_logger(__name__)
+        self.size = size
+        self.timeout = self.config.get('timeout', 30)
+        
+        # 复用SeleniumDriver的浏览器选项构建逻辑
+        self._factory = SeleniumDriver(self.config)
+        self._pool: queue.Queue = queue.Queue(maxsize=size)
+        self._drivers: List[webdriver.Chrome] = []
+        self._drivers_lock = threading.Lock()
+        
+        # 统计信息
+        self.page_load_count = 0
+        self.success_count = 0
+        self.failure_count = 0
+        
+        for _ in range(size):
+            driver = self._factory._create_driver()
+            self._drivers.append(driver)
+            self._pool.put(driver)
+        
+        self.logger.info(f"Selenium驱动池初始化完成，共 {size} 个实例")
+    
+    def acquire(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        借出一个驱动实例
+        
+        Args:
+            timeout: 等待空闲实例的超时时间，None表示一直等待
+            
+        Returns:
+            webdriver.Chrome: 驱动实例
+        """
+        return self._pool.get(timeout=timeout)
+    
+    def release(self, driver: webdriver.Chrome):
+        """
+        归还驱动实例，归还前清理Cookie和缓存
+        
+        Args:
+            driver: 驱动实例
+        """
+        try:
+            driver.delete_all_cookies()
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        except Exception as e:
+            self.logger.warning(f"清理驱动状态失败: {str(e)}")
+        finally:
+            self._pool.put(driver)
+    
+    def _replace(self, driver: webdriver.Chrome) -> Optional[webdriver.Chrome]:
+        """
+        替换已失效的驱动实例
+        
+        先创建新实例再关闭旧实例；创建失败时旧实例从池中移除，不再归还
+        
+        Args:
+            driver: 已失效的驱动实例
+            
+        Returns:
+            Optional[webdriver.Chrome]: 新驱动实例，创建失败时为None
+        """
+        try:
+            new_driver = self._factory._create_driver()
+        except Exception as e:
+            new_driver = None
+            self.logger.error(f"重建驱动失败: {str(e)}")
+        
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        
+        with self._drivers_lock:
+            if new_driver is None:
+                self._drivers = [d for d in self._drivers if d is not driver]
+                self.logger.warning(f"驱动池缩减为 {len(self._drivers)} 个实例")
+            else:
+                self._drivers = [new_driver if d is driver else d for d in self._drivers]
+        return new_driver
+    
+    def get_page_source(self, url: str) -> Optional[str]:
+        """
+        使用池中的驱动获取页面源码
+        
+        Args:
+            url: 目标URL
+            
+        Returns:
+            Optional[str]: 页面源码
+        """
+        self.page_load_count += 1
+        driver = self.acquire()
+        
+        try:
+            driver.get(url)
+            WebDriverWait(driver, self.timeout).until(SeleniumDriver._document_ready)
+            page_source = driver.page_source
+            self.success_count += 1
+            return page_source
+            
+        except TimeoutException:
+            self.failure_count += 1
+            self.logger.error(f"页面加载超时: {url}")
+            return None
+        except WebDriverException as e:
+            self.failure_count += 1
+            self.logger.error(f"WebDriver异常: {url} - {str(e)}")
+            driver = self._replace(driver)
+            return None
+        finally:
+            # 重建失败时失效实例已移出池，不能归还
+            if driver is not None:
+                self.release(driver)
+    
+    def get_stats(self) -> Dict:
+        """
+        获取统计信息
+        
+        Returns:
+            Dict: 统计信息
+        """
+        total_loads = self.page_load_count
+        success_rate = (self.success_count / total_loads * 100) if total_loads > 0 else 0
+        
+        return {
+            'pool_size': self.size,
+            'live_drivers': len(self._drivers),
+            'idle_drivers': self._pool.qsize(),
+            'total_page_loads': total_loads,
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'success_rate': round(success_rate, 2)
+        }
+    
+    def close_all(self):
+        """关闭池中所有驱动"""
+        with self._drivers_lock:
+            drivers, self._drivers = self._drivers, []
+        
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.error(f"关闭驱动失败: {str(e)}")
+        
+        self._pool = queue.Queue(maxsize=self.size)
+        self.logger.info("Selenium驱动池已关闭")
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
\ No newline at end of file
+        self.close_all()
\ No newline at end of file
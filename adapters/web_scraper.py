@@ -6,10 +6,17 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
-from typing import Dict, Optional, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.etree
+import lxml.html
+import shutil
+import hashlib
+import threading
+from typing import Dict, Optional, List, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import logging
 
@@ -18,6 +25,31 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from utils.logger import get_logger
+from utils.json_utils import fast_loads
+from .http_cache import HTTPResponseCache
+
+
+# 默认重试策略，Retry对象不可变，可在实例间共享
+RETRY_STATUS_FORCELIST = frozenset({429, 500, 502, 503, 504})
+RETRY_ALLOWED_METHODS = frozenset({'GET', 'HEAD'})
+
+
+def _build_retry(total: int, backoff_factor: float) -> Retry:
+    """构建重试策略，重试在urllib3连接池内完成并遵循Retry-After响应头"""
+    return Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=RETRY_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+_DEFAULT_RETRY = _build_retry(3, 1)
+
+# 已压缩的安装包/归档格式
+PRECOMPRESSED_EXTENSIONS = ('.dmg', '.pkg', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z')
 
 
 class WebScraper:
@@ -46,6 +78,23 @@ class WebScraper:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/120.0'
         ])
         
+        # 响应缓存（http_cache_ttl > 0 时启用）
+        self.http_cache = None
+        http_cache_ttl = self.config.get('http_cache_ttl', 0)
+        if http_cache_ttl > 0:
+            self.http_cache = HTTPResponseCache(
+                self.config.get('http_cache_dir', '.http_cache'),
+                ttl=http_cache_ttl
+            )
+        
+        # 条件请求（ETag / Last-Modified），按URL记录校验器和最近一次的响应
+        self.conditional_get = self.config.get('conditional_get', True)
+        self.conditional_cache_size = self.config.get('conditional_cache_size', 128)
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._validated_responses: 'OrderedDict[str, requests.Response]' = OrderedDict()
+        # 检测器的工作线程共享同一个爬虫，校验器和副本的读改写需要加锁
+        self._validators_lock = threading.Lock()
+        
         # 创建会话
         self.session = requests.Session()
         self._setup_session()
@@ -61,25 +110,40 @@ class WebScraper:
         self.session.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Accept-Charset': 'utf-8',
             'Accept-Encoding': 'gzip, deflate, br',
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
         
-        # 设置重试策略
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
+        # 设置重试策略（未覆盖默认值时复用模块级实例）
+        if (self.max_retries, self.retry_delay) == (_DEFAULT_RETRY.total, _DEFAULT_RETRY.backoff_factor):
+            retry_strategy = _DEFAULT_RETRY
+        else:
+            retry_strategy = _build_retry(self.max_retries, self.retry_delay)
         
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+        adapter = HTTPAdapter(
+            pool_connections=self.config.get('pool_connections', 32),
+            pool_maxsize=self.config.get('pool_maxsize', 64),
+            pool_block=False,
+            max_retries=retry_strategy
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        
+        # 预构建User-Agent请求头，按顺序轮换使用
+        self._prebuilt_headers = [{'User-Agent': ua} for ua in self.user_agents]
+        self._ua_idx = 0
+    
+    def _next_ua_headers(self) -> Dict:
+        """获取下一个预构建的User-Agent请求头"""
+        if not self._prebuilt_headers:
+            return {}
+        
+        headers = self._prebuilt_headers[self._ua_idx]
+        self._ua_idx = (self._ua_idx + 1) % len(self._prebuilt_headers)
+        return headers
     
     def get_page(self, url: str, **kwargs) -> Optional[requests.Response]:
         """
@@ -94,32 +158,70 @@ class WebScraper:
         """
         self.request_count += 1
         
+        # 优先读取响应缓存
+        cache_key = None
+        if self.http_cache:
+            cache_key = self.http_cache.make_key('GET', url, kwargs.get('params'))
+            cached_response = self.http_cache.get_response(cache_key)
+            if cached_response is not None:
+                self.success_count += 1
+                self.logger.debug("页面缓存命中: %s", url)
+                return cached_response
+        
         try:
-            # 随机选择User-Agent
-            headers = kwargs.get('headers', {})
-            if 'User-Agent' not in headers:
-                headers['User-Agent'] = random.choice(self.user_agents)
-            kwargs['headers'] = headers
+            # 轮换User-Agent
+            headers = kwargs.get('headers')
+            if headers is None:
+                kwargs['headers'] = self._next_ua_headers()
+            elif 'User-Agent' not in headers:
+                headers.update(self._next_ua_headers())
             
             # 设置超时
             kwargs.setdefault('timeout', self.timeout)
             
+            # 附加条件请求头
+            validator_key = HTTPResponseCache.make_key('GET', url, kwargs.get('params'), namespace='validator')
+            request_headers = kwargs['headers']
+            conditional_headers = self._conditional_headers(validator_key)
+            if conditional_headers:
+                kwargs['headers'] = {**request_headers, **conditional_headers}
+            
             # 发送请求
-            self.logger.debug(f"请求页面: {url}")
+            self.logger.debug("请求页面: %s", url)
             response = self.session.get(url, **kwargs)
+            
+            if response.status_code == 304 and conditional_headers:
+                cached_response = self._validated_response(validator_key)
+                if cached_response is not None:
+                    self.success_count += 1
+                    self.logger.debug("页面未修改，使用本地副本: %s", url)
+                    return cached_response
+                
+                # 本地副本已被淘汰，去掉条件头重新请求
+                kwargs['headers'] = request_headers
+                response = self.session.get(url, **kwargs)
+            
             response.raise_for_status()
             
-            # 设置编码
+            # 服务端未声明字符集时requests回退为ISO-8859-1，直接按utf-8处理，
+            # 避免apparent_encoding对整个响应体做字符集探测
             if response.encoding == 'ISO-8859-1':
-                response.encoding = response.apparent_encoding or 'utf-8'
+                response.encoding = 'utf-8'
+            
+            if cache_key:
+                self.http_cache.set_response(cache_key, response)
+            
+            self._remember_validators(validator_key, response)
             
             self.success_count += 1
-            self.logger.debug(f"成功获取页面: {url} (状态码: {response.status_code})")
+            self.logger.debug("成功获取页面: %s (状态码: %s)", url, response.status_code)
             
             return response
             
         except requests.exceptions.RequestException as e:
             self.failure_count += 1
+            if cache_key:
+                self.http_cache.delete(cache_key)
             self.logger.error(f"请求失败: {url} - {str(e)}")
             return None
         except Exception as e:
@@ -127,13 +229,63 @@ class WebScraper:
             self.logger.error(f"未知错误: {url} - {str(e)}")
             return None
     
-    def get_soup(self, url: str, parser: str = 'html.parser', **kwargs) -> Optional[BeautifulSoup]:
+    def _conditional_headers(self, validator_key: str) -> Dict:
+        """根据已记录的校验器构建条件请求头"""
+        if not self.conditional_get:
+            return {}
+        
+        with self._validators_lock:
+            validators = self._validators.get(validator_key)
+            if not validators or validator_key not in self._validated_responses:
+                return {}
+        
+        etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def _validated_response(self, validator_key: str) -> Optional[requests.Response]:
+        """取出校验器对应的本地副本，已被淘汰时清除校验器并返回None"""
+        with self._validators_lock:
+            response = self._validated_responses.get(validator_key)
+            if response is None:
+                self._validators.pop(validator_key, None)
+                return None
+            self._validated_responses.move_to_end(validator_key)
+            return response
+    
+    def _remember_validators(self, validator_key: str, response: requests.Response):
+        """记录响应的ETag/Last-Modified及响应本身，供后续条件请求使用"""
+        if not self.conditional_get:
+            return
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        with self._validators_lock:
+            self._validators[validator_key] = (etag, last_modified)
+            self._validated_responses[validator_key] = response
+            self._validated_responses.move_to_end(validator_key)
+            
+            # 超出容量时淘汰最久未使用的副本
+            while len(self._validated_responses) > self.conditional_cache_size:
+                evicted_key, _ = self._validated_responses.popitem(last=False)
+                self._validators.pop(evicted_key, None)
+    
+    def get_soup(self, url: str, parser: str = 'lxml', parse_only: Optional[SoupStrainer] = None,
+                 **kwargs) -> Optional[BeautifulSoup]:
         """
         获取BeautifulSoup对象
         
         Args:
             url: 目标URL
             parser: 解析器类型
+            parse_only: 只构建匹配的子树，为None时构建完整文档树
             **kwargs: 额外的请求参数
             
         Returns:
@@ -143,9 +295,42 @@ class WebScraper:
         if not response:
             return None
         
+        # 仅在服务端明确声明字符集时指定编码，否则由解析器读取页面内的meta charset
+        declared = 'charset' in response.headers.get('Content-Type', '').lower()
+        return self.parse_html(response.content, parser, response.encoding if declared else None, url, parse_only)
+    
+    def get_raw(self, url: str, **kwargs) -> Optional[bytes]:
+        """
+        获取页面原始字节，供直接在HTML上做正则匹配
+        
+        Args:
+            url: 目标URL
+            **kwargs: 额外的请求参数
+            
+        Returns:
+            Optional[bytes]: 响应体
+        """
+        response = self.get_page(url, **kwargs)
+        return response.content if response else None
+    
+    def parse_html(self, content: Union[bytes, str], parser: str = 'lxml', encoding: Optional[str] = None,
+                   url: str = '', parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """
+        将已获取的页面内容解析为BeautifulSoup对象
+        
+        Args:
+            content: 页面内容
+            parser: 解析器类型
+            encoding: 页面编码，为None时由解析器自行探测
+            url: 页面URL（仅用于日志）
+            parse_only: 只构建匹配的子树，为None时构建完整文档树
+            
+        Returns:
+            Optional[BeautifulSoup]: BeautifulSoup对象
+        """
         try:
-            soup = BeautifulSoup(response.text, parser)
-            return soup
+            # 直接交给解析器处理字节流，避免先在Python层解码为str
+            return BeautifulSoup(content, parser, from_encoding=encoding, parse_only=parse_only)
         except Exception as e:
             self.logger.error(f"解析HTML失败: {url} - {str(e)}")
             return None
@@ -166,12 +351,13 @@ class WebScraper:
             return None
         
         try:
-            return response.json()
+            return fast_loads(response.content)
         except Exception as e:
             self.logger.error(f"解析JSON失败: {url} - {str(e)}")
             return None
     
-    def download_file(self, url: str, local_path: str, chunk_size: int = 8192) -> bool:
+    def download_file(self, url: str, local_path: str, chunk_size: int = 1024 * 1024,
+                      expected_sha256: Optional[str] = None) -> bool:
         """
         下载文件
         
@@ -179,6 +365,7 @@ class WebScraper:
             url: 文件URL
             local_path: 本地保存路径
             chunk_size: 块大小
+            expected_sha256: 期望的SHA-256校验值，提供时在下载过程中同步校验
             
         Returns:
             bool: 是否成功
@@ -186,14 +373,31 @@ class WebScraper:
         try:
             self.logger.info(f"开始下载文件: {url}")
             
-            response = self.session.get(url, stream=True, timeout=self.timeout)
+            # 安装包本身已压缩，避免传输层再做一次解压
+            headers = None
+            if urlparse(url).path.lower().endswith(PRECOMPRESSED_EXTENSIONS):
+                headers = {'Accept-Encoding': 'identity'}
+            
+            response = self.session.get(url, stream=True, timeout=self.timeout, headers=headers)
             response.raise_for_status()
             
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
+            # 无缓冲写入，每个块直接落盘，避免经过Python的IO缓冲层
+            response.raw.decode_content = True
+            with open(local_path, 'wb', buffering=0) as f:
+                if expected_sha256 is None:
+                    shutil.copyfileobj(response.raw, f, length=chunk_size)
+                else:
+                    # 在同一缓冲区上计算哈希，避免下载后再读一遍文件
+                    digest = hashlib.sha256()
+                    for chunk in iter(lambda: response.raw.read(chunk_size), b''):
+                        digest.update(chunk)
                         f.write(chunk)
             
+            if expected_sha256 is not None and digest.hexdigest() != expected_sha256.lower():
+                self.logger.error(f"文件校验失败: {local_path} (SHA-256不匹配)")
+                os.remove(local_path)
+                return False
+            
             self.logger.info(f"文件下载完成: {local_path}")
             return True
             
@@ -205,27 +409,18 @@ class WebScraper:
         """
         带重试的页面获取
         
+        重试（指数退避、Retry-After）已由会话挂载的urllib3重试策略完成，
+        此方法保留为get_page的别名以兼容现有调用。
+        
         Args:
             url: 目标URL
-            max_retries: 最大重试次数
+            max_retries: 已废弃，重试次数由配置中的max_retries决定
             **kwargs: 额外的请求参数
             
         Returns:
             Optional[requests.Response]: 响应对象
         """
-        max_retries = max_retries or self.max_retries
-        
-        for attempt in range(max_retries):
-            response = self.get_page(url, **kwargs)
-            if response:
-                return response
-            
-            if attempt < max_retries - 1:
-                delay = self.retry_delay * (2 ** attempt)  # 指数退避
-                self.logger.warning(f"重试 {attempt + 1}/{max_retries} 在 {delay}s 后: {url}")
-                time.sleep(delay)
-        
-        return None
+        return self.get_page(url, **kwargs)
     
     def check_url_accessibility(self, url: str) -> bool:
         """
@@ -243,6 +438,23 @@ class WebScraper:
         except:
             return False
     
+    def check_many(self, urls: List[str], workers: int = 16) -> Dict[str, bool]:
+        """
+        并发检查多个URL是否可用
+        
+        Args:
+            urls: URL列表
+            workers: 并发线程数
+            
+        Returns:
+            Dict[str, bool]: URL到可用性的映射
+        """
+        if not urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(self.check_url_accessibility, urls)))
+    
     def extract_links(self, soup: BeautifulSoup, base_url: str, 
                      filter_func=None) -> List[str]:
         """
@@ -254,15 +466,19 @@ class WebScraper:
             filter_func: 过滤函数
             
         Returns:
-            List[str]: 链接列表
+            List[str]: 去重后的链接列表（保持页面中的出现顺序）
         """
         links = []
+        seen = set()
         
-        for link in soup.find_all('a', href=True):
+        for link in soup.select('a[href]'):
             href = link.get('href')
             if href:
                 # 转换为绝对URL
                 absolute_url = urljoin(base_url, href)
+                if absolute_url in seen:
+                    continue
+                seen.add(absolute_url)
                 
                 # 应用过滤函数
                 if filter_func is None or filter_func(absolute_url, link):
@@ -291,28 +507,51 @@ class WebScraper:
         
         return images
     
-    def get_page_metadata(self, soup: BeautifulSoup) -> Dict:
+    def get_page_metadata(self, page: Union[BeautifulSoup, bytes, str]) -> Dict:
         """
         提取页面元数据
         
         Args:
-            soup: BeautifulSoup对象
+            page: BeautifulSoup对象，或原始HTML（bytes/str，直接用lxml解析，速度更快）
             
         Returns:
             Dict: 元数据字典
         """
         metadata = {}
         
+        if not isinstance(page, BeautifulSoup):
+            # lxml对空文档抛出ParserError，与BeautifulSoup路径一致返回空字典
+            if not page or not page.strip():
+                return metadata
+            try:
+                tree = lxml.html.fromstring(page)
+            except lxml.etree.ParserError as e:
+                self.logger.debug("解析页面元数据失败: %s", e)
+                return metadata
+            
+            # 标题
+            title = tree.findtext('.//title')
+            if title:
+                metadata['title'] = title.strip()
+            
+            # Meta标签
+            for meta in tree.iter('meta'):
+                name = meta.get('name') or meta.get('property')
+                content = meta.get('content')
+                if name and content:
+                    metadata[name] = content
+            
+            return metadata
+        
         # 标题
-        title = soup.find('title')
+        title = page.find('title')
         if title:
             metadata['title'] = title.get_text().strip()
         
         # Meta标签
-        meta_tags = soup.find_all('meta')
-        for meta in meta_tags:
+        for meta in page.find_all('meta', content=True):
             name = meta.get('name') or meta.get('property')
-            content = meta.get('content')
+            content = meta['content']
             if name and content:
                 metadata[name] = content
         
@@ -328,12 +567,17 @@ class WebScraper:
         total_requests = self.request_count
         success_rate = (self.success_count / total_requests * 100) if total_requests > 0 else 0
         
-        return {
+        stats = {
             'total_requests': total_requests,
             'success_count': self.success_count,
             'failure_count': self.failure_count,
             'success_rate': round(success_rate, 2)
         }
+        
+        if self.http_cache:
+            stats['http_cache'] = self.http_cache.get_stats()
+        
+        return stats
     
     def reset_stats(self):
         """重置统计信息"""
@@ -345,6 +589,8 @@ class WebScraper:
         """关闭会话"""
         if self.session:
             self.session.close()
+        if self.http_cache:
+            self.http_cache.close()
     
     def __enter__(self):
         return self
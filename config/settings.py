@@ -6,149 +6,212 @@
 """
 
 import os
-import yaml
-from typing import Dict, Any
+import copy
+import json
+import functools
+import threading
+from typing import Dict, Any, List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 
 
-def load_config(config_path: str = None) -> Dict[str, Any]:
+# YAML解析结果的JSON旁路缓存文件后缀
+_JSON_CACHE_SUFFIX = '.cache.json'
+
+# YAML配置文件扩展名
+_YAML_EXTENSIONS = ('.yaml', '.yml')
+
+
+# 环境变量到配置路径的映射
+_ENV_MAPPINGS = {
+    'TRACKER_API_HOST': ('api', 'host'),
+    'TRACKER_API_PORT': ('api', 'port'),
+    'TRACKER_API_DEBUG': ('api', 'debug'),
+    'TRACKER_CACHE_TYPE': ('cache', 'type'),
+    'TRACKER_CACHE_TTL': ('cache', 'ttl'),
+    'TRACKER_LOG_LEVEL': ('logging', 'level'),
+    'TRACKER_SELENIUM_HEADLESS': ('selenium', 'headless'),
+    'TRACKER_GITHUB_TOKEN': ('strategies', 'github', 'api_token'),
+    'TRACKER_SLACK_WEBHOOK': ('notifications', 'channels', 'slack', 'webhook_url'),
+    'TRACKER_EMAIL_SMTP_SERVER': ('notifications', 'channels', 'email', 'smtp_server'),
+    'TRACKER_EMAIL_USERNAME': ('notifications', 'channels', 'email', 'username'),
+    'TRACKER_EMAIL_PASSWORD': ('notifications', 'channels', 'email', 'password'),
+}
+
+# 需要做类型转换的配置键
+_INT_KEYS = frozenset({'port', 'ttl', 'max_size', 'backup_count', 'update_interval'})
+_BOOL_KEYS = frozenset({'debug', 'headless', 'enabled', 'auto_update'})
+
+
+# 默认User-Agent和Chrome启动参数，使用不可变元组在各次加载间共享
+_USER_AGENTS = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+)
+
+_CHROME_OPTIONS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-images',
+    '--disable-javascript',
+)
+
+
+# 默认配置
+_DEFAULT_CONFIG = {
+    # 检测器配置
+    'detector': {
+        'timeout': 30,
+        'max_retries': 3,
+        'max_workers': 10,
+        'cache_ttl': 3600,
+    },
+    
+    # 网页爬虫配置
+    'scraper': {
+        'timeout': 30,
+        'max_retries': 3,
+        'retry_delay': 1,
+        'user_agents': _USER_AGENTS
+    },
+    
+    # Selenium配置
+    'selenium': {
+        'headless': True,
+        'timeout': 30,
+        'window_size': (1920, 1080),
+        'chrome_options': _CHROME_OPTIONS
+    },
+    
+    # API配置
+    'api': {
+        'host': '0.0.0.0',
+        'port': 8080,
+        'debug': False,
+        'cors_enabled': True,
+    },
+    
+    # 缓存配置
+    'cache': {
+        'type': 'memory',  # memory, redis, disk
+        'ttl': 3600,
+        'max_size': 1000,
+    },
+    
+    # 通知配置
+    'notifications': {
+        'enabled': True,
+        'channels': {
+            'slack': {
+                'enabled': False,
+                'webhook_url': '',
+            },
+            'email': {
+                'enabled': False,
+                'smtp_server': '',
+                'smtp_port': 587,
+                'username': '',
+                'password': '',
+            },
+            'dingtalk': {
+                'enabled': False,
+                'webhook_url': '',
+                'secret': '',
+            }
+        }
+    },
+    
+    # 日志配置
+    'logging': {
+        'level': 'INFO',
+        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        'file': 'logs/app.log',
+        'max_size': '10MB',
+        'backup_count': 5,
+    },
+    
+    # 版本服务配置
+    'version_service': {
+        'auto_update': False,
+        'update_interval': 3600,
+        'batch_size': 50,
+        'max_history_per_software': 100,
+    },
+    
+    # 策略配置
+    'strategies': {
+        # 策略共享的页面缓存（页面数、生存时间秒），max_size为0时关闭
+        'page_cache': {
+            'max_size': 128,
+            'ttl': 300,
+        },
+        'github': {
+            'priority': 90,
+            'api_token': '',  # GitHub API token for higher rate limits
+        },
+        'chrome': {
+            'priority': 85,
+        },
+        'microsoft': {
+            'priority': 80,
+        },
+        'generic': {
+            'priority': 1,
+        }
+    }
+}
+
+
+def load_config(config_path: Union[str, List[str], None] = None) -> Dict[str, Any]:
     """
     加载配置文件
     
     Args:
-        config_path: 配置文件路径
+        config_path: 配置文件路径，或按顺序合并的多个配置文件路径
         
     Returns:
         Dict[str, Any]: 配置字典
     """
-    # 默认配置
-    default_config = {
-        # 检测器配置
-        'detector': {
-            'timeout': 30,
-            'max_retries': 3,
-            'max_workers': 10,
-            'cache_ttl': 3600,
-        },
-        
-        # 网页爬虫配置
-        'scraper': {
-            'timeout': 30,
-            'max_retries': 3,
-            'retry_delay': 1,
-            'user_agents': [
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            ]
-        },
-        
-        # Selenium配置
-        'selenium': {
-            'headless': True,
-            'timeout': 30,
-            'window_size': (1920, 1080),
-            'chrome_options': [
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--disable-images',
-                '--disable-javascript',
-            ]
-        },
-        
-        # API配置
-        'api': {
-            'host': '0.0.0.0',
-            'port': 8080,
-            'debug': False,
-            'cors_enabled': True,
-        },
-        
-        # 缓存配置
-        'cache': {
-            'type': 'memory',  # memory, redis, disk
-            'ttl': 3600,
-            'max_size': 1000,
-        },
-        
-        # 通知配置
-        'notifications': {
-            'enabled': True,
-            'channels': {
-                'slack': {
-                    'enabled': False,
-                    'webhook_url': '',
-                },
-                'email': {
-                    'enabled': False,
-                    'smtp_server': '',
-                    'smtp_port': 587,
-                    'username': '',
-                    'password': '',
-                },
-                'dingtalk': {
-                    'enabled': False,
-                    'webhook_url': '',
-                    'secret': '',
-                }
-            }
-        },
-        
-        # 日志配置
-        'logging': {
-            'level': 'INFO',
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            'file': 'logs/app.log',
-            'max_size': '10MB',
-            'backup_count': 5,
-        },
-        
-        # 版本服务配置
-        'version_service': {
-            'auto_update': False,
-            'update_interval': 3600,
-            'batch_size': 50,
-            'max_history_per_software': 100,
-        },
-        
-        # 策略配置
-        'strategies': {
-            'github': {
-                'priority': 90,
-                'api_token': '',  # GitHub API token for higher rate limits
-            },
-            'chrome': {
-                'priority': 85,
-            },
-            'microsoft': {
-                'priority': 80,
-            },
-            'generic': {
-                'priority': 1,
-            }
-        }
-    }
+    if config_path is None or isinstance(config_path, str):
+        config_paths = (config_path,) if config_path else ()
+    else:
+        config_paths = tuple(config_path)
     
-    # 如果指定了配置文件，加载并合并
-    if config_path and os.path.exists(config_path):
+    # 以文件修改时间和相关环境变量作为缓存键，任一变化即重新加载
+    file_items = []
+    for path in config_paths:
         try:
-            if config_path.endswith('.yaml') or config_path.endswith('.yml'):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    file_config = yaml.safe_load(f)
-            elif config_path.endswith('.py'):
-                # 动态导入Python配置文件
-                import importlib.util
-                spec = importlib.util.spec_from_file_location("config", config_path)
-                config_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(config_module)
-                file_config = getattr(config_module, 'CONFIG', {})
-            else:
-                raise ValueError(f"不支持的配置文件格式: {config_path}")
-            
-            # 递归合并配置
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        file_items.append((path, mtime_ns))
+    env_items = tuple(sorted((key, os.environ[key]) for key in _ENV_MAPPINGS.keys() & os.environ.keys()))
+    
+    # 缓存中的字典是共享的，返回副本供调用方修改
+    return copy.deepcopy(_load_config_cached(tuple(file_items), env_items))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(file_items: Tuple, env_items: Tuple) -> Dict[str, Any]:
+    """
+    加载配置文件（结果按参数缓存）
+    
+    Args:
+        file_items: (配置文件路径, 修改时间) 元组，修改时间仅用作缓存键
+        env_items: 相关环境变量，仅用作缓存键
+        
+    Returns:
+        Dict[str, Any]: 配置字典
+    """
+    # 默认配置（独立副本，元组只读可直接共享）
+    default_config = copy.deepcopy(_DEFAULT_CONFIG)
+    
+    # 如果指定了配置文件，加载并按顺序合并
+    config_paths = [path for path, _ in file_items if path and os.path.exists(path)]
+    for file_config in _load_config_files(config_paths):
+        # 递归合并配置（空YAML文件解析结果为None）
+        if file_config:
             default_config = _merge_config(default_config, file_config)
-            
-        except Exception as e:
-            print(f"警告: 加载配置文件失败 {config_path}: {str(e)}")
     
     # 从环境变量覆盖配置
     default_config = _load_env_config(default_config)
@@ -156,9 +219,130 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     return default_config
 
 
+def _load_config_files(config_paths: List[str]) -> List[Any]:
+    """
+    加载多个配置文件，多个YAML文件时在线程池中并行读取和解析
+    
+    Args:
+        config_paths: 配置文件路径列表
+        
+    Returns:
+        List[Any]: 与config_paths顺序一致的配置，加载失败为None
+    """
+    yaml_count = sum(1 for path in config_paths if path.endswith(_YAML_EXTENSIONS))
+    
+    # 少于两个YAML文件时无需并行
+    if yaml_count < 2:
+        return [_load_config_file(path) for path in config_paths]
+    
+    # 调用方进程中已有检测、HTTP和日志线程，fork子进程可能复制被持有的锁导致死锁，
+    # 少量小配置文件也不值得启动进程，因此使用线程池；Python配置文件仍按顺序在当前线程执行
+    yaml_paths = [path for path in config_paths if path.endswith(_YAML_EXTENSIONS)]
+    with ThreadPoolExecutor(max_workers=min(yaml_count, 8)) as executor:
+        parsed = dict(zip(yaml_paths, executor.map(_load_config_file, yaml_paths)))
+    
+    return [parsed[path] if path in parsed else _load_config_file(path) for path in config_paths]
+
+
+def _load_config_file(config_path: str) -> Any:
+    """
+    加载单个配置文件
+    
+    Args:
+        config_path: 配置文件路径
+        
+    Returns:
+        Any: 配置内容，加载失败返回None
+    """
+    try:
+        if config_path.endswith(_YAML_EXTENSIONS):
+            return _load_yaml_config(config_path)
+        elif config_path.endswith('.py'):
+            # 动态导入Python配置文件
+            import importlib.util
+            spec = importlib.util.spec_from_file_location("config", config_path)
+            config_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(config_module)
+            return getattr(config_module, 'CONFIG', {})
+        else:
+            raise ValueError(f"不支持的配置文件格式: {config_path}")
+    
+    except Exception as e:
+        print(f"警告: 加载配置文件失败 {config_path}: {str(e)}")
+        return None
+
+
+def _load_yaml_config(config_path: str) -> Any:
+    """
+    加载YAML配置文件，解析结果缓存在同目录的JSON旁路文件中
+    
+    Args:
+        config_path: YAML配置文件路径
+        
+    Returns:
+        Any: 解析后的配置
+    """
+    cache_path = config_path + _JSON_CACHE_SUFFIX
+    
+    # 旁路文件不早于YAML文件时直接读取JSON
+    try:
+        if os.stat(cache_path).st_mtime_ns >= os.stat(config_path).st_mtime_ns:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    # 仅在确实需要解析YAML时才导入PyYAML
+    import yaml
+    
+    # 优先使用libyaml实现的C加载器，未编译libyaml时回退到纯Python实现
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    
+    # 以二进制文件对象交给libyaml分块读取，由C层完成UTF-8解码
+    with open(config_path, 'rb') as f:
+        file_config = yaml.load(f, Loader=loader)
+    
+    # 含非字符串键时json.dump会静默转成字符串，读回结果不同，不写旁路文件
+    if not _json_round_trips(file_config):
+        return file_config
+    
+    # 写入旁路文件失败（只读目录、含日期等非JSON类型）不影响加载
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(file_config, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    
+    return file_config
+
+
+def _json_round_trips(value: Any) -> bool:
+    """
+    检查配置经JSON序列化后读回是否不变（所有字典键都是字符串）
+    
+    其他非JSON类型（日期、集合等）由json.dump抛出TypeError处理
+    
+    Args:
+        value: YAML解析结果
+        
+    Returns:
+        bool: 字典键均为字符串时为True
+    """
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _json_round_trips(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_json_round_trips(item) for item in value)
+    return True
+
+
 def _merge_config(base_config: Dict, override_config: Dict) -> Dict:
     """
-    递归合并配置字典
+    合并配置字典（原地修改base_config）
     
     Args:
         base_config: 基础配置
@@ -167,15 +351,20 @@ def _merge_config(base_config: Dict, override_config: Dict) -> Dict:
     Returns:
         Dict: 合并后的配置
     """
-    result = base_config.copy()
+    if not override_config:
+        return base_config
     
-    for key, value in override_config.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _merge_config(result[key], value)
-        else:
-            result[key] = value
+    # 用显式栈逐层合并嵌套字典，不再为每一层复制字典
+    stack = [(base_config, override_config)]
+    while stack:
+        base, override = stack.pop()
+        for key, value in override.items():
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                stack.append((base[key], value))
+            else:
+                base[key] = value
     
-    return result
+    return base_config
 
 
 def _load_env_config(config: Dict) -> Dict:
@@ -188,40 +377,26 @@ def _load_env_config(config: Dict) -> Dict:
     Returns:
         Dict: 更新后的配置
     """
-    # 定义环境变量映射
-    env_mappings = {
-        'TRACKER_API_HOST': ['api', 'host'],
-        'TRACKER_API_PORT': ['api', 'port'],
-        'TRACKER_API_DEBUG': ['api', 'debug'],
-        'TRACKER_CACHE_TYPE': ['cache', 'type'],
-        'TRACKER_CACHE_TTL': ['cache', 'ttl'],
-        'TRACKER_LOG_LEVEL': ['logging', 'level'],
-        'TRACKER_SELENIUM_HEADLESS': ['selenium', 'headless'],
-        'TRACKER_GITHUB_TOKEN': ['strategies', 'github', 'api_token'],
-        'TRACKER_SLACK_WEBHOOK': ['notifications', 'channels', 'slack', 'webhook_url'],
-        'TRACKER_EMAIL_SMTP_SERVER': ['notifications', 'channels', 'email', 'smtp_server'],
-        'TRACKER_EMAIL_USERNAME': ['notifications', 'channels', 'email', 'username'],
-        'TRACKER_EMAIL_PASSWORD': ['notifications', 'channels', 'email', 'password'],
-    }
-    
-    for env_var, config_path in env_mappings.items():
-        env_value = os.getenv(env_var)
-        if env_value is not None:
-            # 设置嵌套配置值
-            current = config
-            for key in config_path[:-1]:
-                if key not in current:
-                    current[key] = {}
-                current = current[key]
-            
-            # 类型转换
-            final_key = config_path[-1]
-            if final_key in ['port', 'ttl', 'max_size', 'backup_count', 'update_interval']:
-                current[final_key] = int(env_value)
-            elif final_key in ['debug', 'headless', 'enabled', 'auto_update']:
-                current[final_key] = env_value.lower() in ('true', '1', 'yes', 'on')
-            else:
-                current[final_key] = env_value
+    # 只处理实际设置了的环境变量
+    for env_var in _ENV_MAPPINGS.keys() & os.environ.keys():
+        env_value = os.environ[env_var]
+        config_path = _ENV_MAPPINGS[env_var]
+        
+        # 设置嵌套配置值
+        current = config
+        for key in config_path[:-1]:
+            if key not in current:
+                current[key] = {}
+            current = current[key]
+        
+        # 类型转换
+        final_key = config_path[-1]
+        if final_key in _INT_KEYS:
+            current[final_key] = int(env_value)
+        elif final_key in _BOOL_KEYS:
+            current[final_key] = env_value.lower() in ('true', '1', 'yes', 'on')
+        else:
+            current[final_key] = env_value
     
     return config
 
@@ -7,11 +7,13 @@
 """
 
 import asyncio
+import hashlib
 import logging
+import sys
 from typing import List, Dict, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
-import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from urllib.parse import urlparse
 
 from .strategies.strategy_manager import StrategyManager
@@ -25,7 +27,11 @@ from ..utils.logger import get_logger
 from ..utils.validators import validate_software_info
 
 
-@dataclass
+# Python 3.10+ 的数据类使用__slots__，减少实例内存并加快属性访问
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SoftwareInfo:
     """软件信息数据类"""
     name: str
@@ -34,7 +40,7 @@ class SoftwareInfo:
     metadata: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DetectionResult:
     """检测结果数据类"""
     name: str
@@ -53,6 +59,23 @@ class DetectionResult:
             self.detection_time = datetime.now()
 
 
+# 失败结果模板，只需替换名称和错误信息
+_FAILURE_TEMPLATE = DetectionResult(
+    name='',
+    version=None,
+    download_url=None,
+    release_date=None,
+    file_size=None,
+    checksum=None,
+    success=False
+)
+
+
+def _failure_result(name: str, error_message: str) -> DetectionResult:
+    """基于模板生成失败结果（检测时间重新取当前时间）"""
+    return replace(_FAILURE_TEMPLATE, name=name, error_message=error_message, detection_time=None)
+
+
 class SoftwareVersionDetector:
     """软件版本检测器主类"""
     
@@ -77,19 +100,35 @@ class SoftwareVersionDetector:
         self.api_client = APIClient(self.config.get('api', {}))
         self.selenium_driver = SeleniumDriver(self.config.get('selenium', {}))
         
+        # 传给策略的上下文，在重试和多次检测之间复用
+        self._strategy_ctx = {
+            'web_scraper': self.web_scraper,
+            'api_client': self.api_client,
+            'selenium_driver': self.selenium_driver,
+            'version_parser': self.version_parser
+        }
+        
         # 性能配置
         self.max_workers = self.config.get('max_workers', 10)
         self.timeout = self.config.get('timeout', 30)
         self.max_retries = self.config.get('max_retries', 3)
         
+        # 常驻线程池，批量检测和异步检测之间复用工作线程
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='detector')
+        
+        # 异步检测的并发信号量，在所属事件循环内延迟创建
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop = None
+        
         self.logger.info("软件版本检测器初始化完成")
     
-    def detect_version(self, software_info: Union[SoftwareInfo, Dict]) -> DetectionResult:
+    def detect_version(self, software_info: Union[SoftwareInfo, Dict], check_cache: bool = True) -> DetectionResult:
         """
         检测单个软件版本
         
         Args:
             software_info: 软件信息
+            check_cache: 是否先查询缓存（批量检测已统一查询过时为False）
             
         Returns:
             DetectionResult: 检测结果
@@ -110,14 +149,15 @@ class SoftwareVersionDetector:
                 error_message="无效的软件信息"
             )
         
-        self.logger.info(f"开始检测软件版本: {software_info.name}")
+        self.logger.info("开始检测软件版本: %s", software_info.name)
         
         # 检查缓存
-        cache_key = f"version:{software_info.name}:{hash(software_info.url)}"
-        cached_result = self.cache_service.get(cache_key)
-        if cached_result:
-            self.logger.info(f"从缓存获取结果: {software_info.name}")
-            return cached_result
+        cache_key = self._cache_key(software_info)
+        if check_cache:
+            cached_result = self.cache_service.get(cache_key)
+            if cached_result:
+                self.logger.info("从缓存获取结果: %s", software_info.name)
+                return cached_result
         
         # 执行检测
         result = self._execute_detection(software_info)
@@ -132,9 +172,15 @@ class SoftwareVersionDetector:
         else:
             self.notification_service.notify_detection_failed(result)
         
-        self.logger.info(f"检测完成: {software_info.name} - {result.version if result.success else '失败'}")
+        self.logger.info("检测完成: %s - %s", software_info.name, result.version if result.success else '失败')
         return result
     
+    @staticmethod
+    def _cache_key(software_info: SoftwareInfo) -> str:
+        """生成跨进程稳定的缓存键（内置hash对字符串按进程随机化）"""
+        url_digest = hashlib.blake2b(software_info.url.encode('utf-8'), digest_size=8).hexdigest()
+        return f"version:{software_info.name}:{url_digest}"
+    
     def batch_detect(self, software_list: List[Union[SoftwareInfo, Dict]], 
                     concurrent: bool = True) -> List[DetectionResult]:
         """
@@ -149,45 +195,92 @@ class SoftwareVersionDetector:
         """
         self.logger.info(f"开始批量检测 {len(software_list)} 个软件")
         
+        # 一次性批量读取缓存，结果按输入顺序排列
+        results: List[Optional[DetectionResult]] = [None] * len(software_list)
+        cache_keys = {}
+        for index, software_info in enumerate(software_list):
+            try:
+                if isinstance(software_info, dict):
+                    software_info = SoftwareInfo(**software_info)
+                cache_keys[index] = self._cache_key(software_info)
+            except Exception:
+                # 无效条目交由detect_version生成失败结果
+                pass
+        
+        cached_results = self.cache_service.mget(list(cache_keys.values()))
+        for index, cached_result in zip(cache_keys, cached_results):
+            if cached_result:
+                results[index] = cached_result
+        
+        # 只检测缓存未命中的软件
+        pending = [index for index, result in enumerate(results) if result is None]
+        
         if not concurrent:
             # 串行执行
-            results = []
-            for software_info in software_list:
-                result = self.detect_version(software_info)
-                results.append(result)
+            for index in pending:
+                results[index] = self.detect_version(software_list[index], check_cache=False)
             return results
         
-        # 并发执行
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_software = {
-                executor.submit(self.detect_version, software_info): software_info
-                for software_info in software_list
-            }
-            
-            results = []
-            for future in concurrent.futures.as_completed(future_to_software):
-                try:
-                    result = future.result(timeout=self.timeout)
-                    results.append(result)
-                except Exception as e:
-                    software_info = future_to_software[future]
-                    name = software_info.name if hasattr(software_info, 'name') else software_info.get('name', 'Unknown')
-                    self.logger.error(f"检测失败: {name} - {str(e)}")
-                    results.append(DetectionResult(
-                        name=name,
-                        version=None,
-                        download_url=None,
-                        release_date=None,
-                        file_size=None,
-                        checksum=None,
-                        success=False,
-                        error_message=str(e)
-                    ))
+        # 并发执行：使用常驻线程池。超时后仍在运行的任务无法取消，但适配器的每个请求都带超时
+        # （requests的timeout、Selenium的页面加载超时），这些任务会在有限时间内结束并归还线程
+        future_to_index = {
+            self._executor.submit(self.detect_version, software_list[index], False): index
+            for index in pending
+        }
+        
+        # 整批共用一个截止时间：每轮工作线程最多等待timeout，而不是每个任务各等待timeout
+        waves = -(-len(pending) // self.max_workers)
+        try:
+            for future in as_completed(future_to_index, timeout=self.timeout * max(waves, 1)):
+                index = future_to_index[future]
+                results[index] = self._batch_result(future, software_list[index])
+        except FuturesTimeoutError:
+            for future, index in future_to_index.items():
+                if results[index] is not None:
+                    continue
+                # 截止前已完成但尚未被as_completed产出的任务保留真实结果
+                if future.done() and not future.cancelled():
+                    results[index] = self._batch_result(future, software_list[index])
+                else:
+                    # 取消尚未开始的任务，避免占用常驻线程池
+                    future.cancel()
+                    results[index] = self._batch_failure(software_list[index], "批量检测超时")
         
         success_count = sum(1 for r in results if r.success)
         self.logger.info(f"批量检测完成: {success_count}/{len(results)} 成功")
         return results
     
+    def _batch_result(self, future, software_info: Union[SoftwareInfo, Dict]) -> DetectionResult:
+        """
+        取出已完成任务的结果，任务抛出异常时生成失败结果
+        
+        Args:
+            future: 已完成的任务
+            software_info: 软件信息
+            
+        Returns:
+            DetectionResult: 检测结果
+        """
+        try:
+            return future.result()
+        except Exception as e:
+            return self._batch_failure(software_info, str(e))
+    
+    def _batch_failure(self, software_info: Union[SoftwareInfo, Dict], error_message: str) -> DetectionResult:
+        """
+        生成批量检测中单个任务的失败结果
+        
+        Args:
+            software_info: 软件信息
+            error_message: 错误信息
+            
+        Returns:
+            DetectionResult: 失败结果
+        """
+        name = software_info.name if hasattr(software_info, 'name') else software_info.get('name', 'Unknown')
+        self.logger.error(f"检测失败: {name} - {error_message}")
+        return _failure_result(name, error_message)
+    
     async def async_detect_version(self, software_info: Union[SoftwareInfo, Dict]) -> DetectionResult:
         """
         异步检测单个软件版本
@@ -198,8 +291,16 @@ class SoftwareVersionDetector:
         Returns:
             DetectionResult: 检测结果
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.detect_version, software_info)
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(self._executor, self.detect_version, software_info)
+    
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """获取当前事件循环的并发信号量"""
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_workers)
+            self._sem_loop = loop
+        return self._sem
     
     async def async_batch_detect(self, software_list: List[Union[SoftwareInfo, Dict]]) -> List[DetectionResult]:
         """
@@ -220,16 +321,7 @@ class SoftwareVersionDetector:
             if isinstance(result, Exception):
                 software_info = software_list[i]
                 name = software_info.name if hasattr(software_info, 'name') else software_info.get('name', 'Unknown')
-                processed_results.append(DetectionResult(
-                    name=name,
-                    version=None,
-                    download_url=None,
-                    release_date=None,
-                    file_size=None,
-                    checksum=None,
-                    success=False,
-                    error_message=str(result)
-                ))
+                processed_results.append(_failure_result(name, str(result)))
             else:
                 processed_results.append(result)
         
@@ -249,15 +341,10 @@ class SoftwareVersionDetector:
             try:
                 # 选择检测策略
                 strategy = self.strategy_manager.select_strategy(software_info)
-                self.logger.debug(f"使用策略: {strategy.name} for {software_info.name}")
+                self.logger.debug("使用策略: %s for %s", strategy.name, software_info.name)
                 
                 # 执行检测
-                raw_result = strategy.detect(software_info, {
-                    'web_scraper': self.web_scraper,
-                    'api_client': self.api_client,
-                    'selenium_driver': self.selenium_driver,
-                    'version_parser': self.version_parser
-                })
+                raw_result = strategy.detect(software_info, self._strategy_ctx)
                 
                 # 解析结果
                 if raw_result and raw_result.get('success'):
@@ -274,7 +361,7 @@ class SoftwareVersionDetector:
                 else:
                     error_msg = raw_result.get('error', '检测失败') if raw_result else '无返回结果'
                     if attempt < self.max_retries - 1:
-                        self.logger.warning(f"检测失败，尝试重试 ({attempt + 1}/{self.max_retries}): {error_msg}")
+                        self.logger.warning("检测失败，尝试重试 (%d/%d): %s", attempt + 1, self.max_retries, error_msg)
                         continue
                     else:
                         return DetectionResult(
@@ -292,7 +379,7 @@ class SoftwareVersionDetector:
             except Exception as e:
                 error_msg = str(e)
                 if attempt < self.max_retries - 1:
-                    self.logger.warning(f"检测异常，尝试重试 ({attempt + 1}/{self.max_retries}): {error_msg}")
+                    self.logger.warning("检测异常，尝试重试 (%d/%d): %s", attempt + 1, self.max_retries, error_msg)
                     continue
                 else:
                     self.logger.error(f"检测失败: {software_info.name} - {error_msg}")
@@ -319,6 +406,16 @@ class SoftwareVersionDetector:
             error_message="未知错误"
         )
     
+    def close(self):
+        """关闭检测器线程池"""
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def get_supported_software(self) -> List[Dict]:
         """
         获取支持的软件列表
@@ -5,16 +5,184 @@
 版本号解析器 - 提供统一的版本号解析和比较功能
 """
 
+import os
 import re
-from typing import List, Optional, Tuple
+import sys
+import functools
+import itertools
+import threading
+import multiprocessing
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from ...utils.logger import get_logger
+from ...utils.regex_utils import compile_scan_pattern
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
-@dataclass
+
+# Python 3.10+ 的数据类使用__slots__，减少实例内存并加快属性访问
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 版本字符串中需要移除的前缀，按列表顺序依次尝试
+_VERSION_PREFIXES = (
+    'version', 'ver', 'v', 'release', 'rel', 'r',
+    'build', 'b', '版本', '发布', '构建'
+)
+
+# 清理版本字符串用的预编译正则：每个前缀一个可选分组，按列表顺序排列，
+# 结果与按顺序逐个移除开头的前缀相同（每个前缀最多移除一次，如'Release v2.0'只移除'Release '）
+_PREFIX_RE = re.compile(
+    '^' + ''.join(rf'(?:{re.escape(prefix)}\s*[:\-]?\s*)?' for prefix in _VERSION_PREFIXES),
+    re.IGNORECASE
+)
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_DIGIT_RE = re.compile(r'\d')
+_PUNCT_RE = re.compile(r'[^\w\.\-\+]')
+_SPACES_RE = re.compile(r'\s+')
+
+# 打包比较键时每个版本组件占用的位数（minor/patch/build需小于2**32，major不限）
+_KEY_LANE_BITS = 32
+
+# 含反向引用的模式包进合并正则后组号会错位，不能参与合并
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# 文本超过该长度（字符）时，多个模式分发到进程池并行findall
+PARALLEL_EXTRACT_MIN_SIZE = 1 << 20
+
+_extract_executor = None
+_extract_executor_lock = threading.Lock()
+
+
+def _findall(pattern: str, text: str) -> list:
+    """在进程池中执行的findall（需为模块级函数以便序列化）"""
+    return _compile_scan(pattern).findall(text)
+
+
+def _get_extract_executor() -> Optional[ProcessPoolExecutor]:
+    """获取大文本版本号提取共享的进程池，单核环境返回None"""
+    global _extract_executor
+    
+    cpu_count = os.cpu_count() or 1
+    if cpu_count < 2:
+        return None
+    
+    with _extract_executor_lock:
+        if _extract_executor is None:
+            # 进程池可能在检测器工作线程中创建，此时其他线程可能持有锁（日志、连接池），
+            # fork会把这些锁原样复制进子进程导致死锁，改用forkserver（不支持时用spawn）启动子进程
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _extract_executor = ProcessPoolExecutor(
+                max_workers=min(cpu_count, len(VersionParser.BUILTIN_PATTERNS)),
+                mp_context=multiprocessing.get_context(start_method)
+            )
+        return _extract_executor
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """编译正则表达式并在进程内缓存"""
+    return re.compile(pattern, flags)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_scan(pattern: str):
+    """
+    编译用于扫描页面文本的模式（忽略大小写）
+    
+    可用时使用RE2线性时间引擎，避免恶意页面触发回溯爆炸；\\s、\\d按re的Unicode语义改写，
+    RE2不支持的语法（如反向引用、环视）回退到re（见compile_scan_pattern）
+    """
+    return compile_scan_pattern(pattern, re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_combined(patterns: Tuple[str, ...], flags: int = 0):
+    """
+    将多个模式合并为一个交替分支正则（按模式组合缓存）
+    
+    Returns:
+        合并后的正则和 {外层组号: (模式序号, 内层组数)}，无法合并时返回(None, None)
+    """
+    if any(_BACKREF_RE.search(pattern) for pattern in patterns):
+        return None, None
+    
+    try:
+        group_map = {}
+        group_index = 1
+        for index, pattern in enumerate(patterns):
+            group_count = _compile(pattern, flags).groups
+            group_map[group_index] = (index, group_count)
+            group_index += group_count + 1
+        combined = re.compile('|'.join(f'({pattern})' for pattern in patterns), flags)
+        return combined, group_map
+    except re.error as e:
+        get_logger(__name__).debug(f"合并版本号模式失败，逐个模式匹配: {str(e)}")
+        return None, None
+
+
+@functools.lru_cache(maxsize=32)
+def _build_prefilter_db(patterns: Tuple[str, ...]):
+    """构建Hyperscan多模式预筛选库（按模式组合缓存），不可用时返回None"""
+    if hyperscan is None:
+        return None
+    
+    try:
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH |
+                 hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns),
+        )
+        return db
+    except Exception as e:
+        get_logger(__name__).warning(f"构建Hyperscan预筛选库失败，逐个模式扫描: {str(e)}")
+        return None
+
+
+def _pack_key(major: int, minor: int = 0, patch: int = 0, build: int = 0) -> int:
+    """将版本号组件打包为单个整数比较键"""
+    return ((major << _KEY_LANE_BITS | minor) << _KEY_LANE_BITS | patch) << _KEY_LANE_BITS | build
+
+
+def _extract_version_components(groups: Tuple[Optional[str], ...]) -> Optional[Tuple[int, int, int, int, str, str]]:
+    """
+    从正则分组中提取版本组件（纯函数，不依赖解析器状态）
+    
+    Args:
+        groups: 正则匹配的分组
+        
+    Returns:
+        Optional[Tuple[int, int, int, int, str, str]]: (major, minor, patch, build, pre_release, metadata)，无有效分组时返回None
+    """
+    # 过滤None值
+    values = [g for g in groups if g is not None]
+    if not values:
+        return None
+    
+    # 提取主要版本号组件，缺失的部分补0
+    numbers = [int(g) for g in values[:4] if g.isdigit()]
+    numbers += [0] * (4 - len(numbers))
+    
+    # 提取预发布信息和元数据
+    count = len(values)
+    pre_release = values[4] if count >= 5 and values[4] and not values[4].isdigit() else ""
+    metadata = values[5] if count >= 6 and values[5] else ""
+    
+    return numbers[0], numbers[1], numbers[2], numbers[3], pre_release, metadata
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class VersionInfo:
-    """版本信息数据类"""
+    """版本信息数据类（不可变，解析缓存中的实例可安全共享）"""
     raw: str  # 原始版本字符串
     major: int = 0
     minor: int = 0
@@ -29,11 +197,48 @@ class VersionInfo:
     def to_tuple(self) -> Tuple[int, int, int, int]:
         """转换为元组用于比较"""
         return (self.major, self.minor, self.patch, self.build)
+    
+    def to_key(self) -> int:
+        """打包为单个整数用于比较，与to_tuple()的大小顺序一致"""
+        return _pack_key(self.major, self.minor, self.patch, self.build)
 
 
 class VersionParser:
     """版本号解析器"""
     
+    # 内置版本号模式
+    BUILTIN_PATTERNS = (
+        # 标准语义化版本 (1.2.3, 1.2.3-alpha.1+build.123)
+        r'v?(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?(?:-([a-zA-Z0-9\-\.]+))?(?:\+([a-zA-Z0-9\-\.]+))?',
+        
+        # 年份版本 (2024.1.0, 2024.03.15)
+        r'(\d{4})\.(\d{1,2})\.(\d{1,2})(?:\.(\d+))?',
+        
+        # 简化版本 (1.2, 2.0)
+        r'v?(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?',
+        
+        # Build版本 (Build 123, Build 1.2.3)
+        r'[Bb]uild\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
+        
+        # Release版本 (Release 1.0, R1.2.3)
+        r'[Rr]elease\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
+        
+        # 版本号前缀 (Version 1.2.3, Ver 1.0)
+        r'[Vv]er(?:sion)?\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
+        
+        # 纯数字版本 (123, 2024)
+        r'^(\d+)$',
+        
+        # Chrome风格版本 (120.0.6099.109)
+        r'(\d+)\.(\d+)\.(\d+)\.(\d+)',
+        
+        # 日期版本 (20240315, 2024-03-15)
+        r'(\d{4})-?(\d{2})-?(\d{2})',
+        
+        # 特殊格式 (1.0-SNAPSHOT, 2.0.0.RELEASE)
+        r'(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?[-\.]([A-Z]+)',
+    )
+    
     def __init__(self, custom_patterns: List[str] = None):
         """
         初始化版本解析器
@@ -43,46 +248,29 @@ class VersionParser:
         """
         self.logger = get_logger(__name__)
         
-        # 内置版本号模式
-        self.builtin_patterns = [
-            # 标准语义化版本 (1.2.3, 1.2.3-alpha.1+build.123)
-            r'v?(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?(?:-([a-zA-Z0-9\-\.]+))?(?:\+([a-zA-Z0-9\-\.]+))?',
-            
-            # 年份版本 (2024.1.0, 2024.03.15)
-            r'(\d{4})\.(\d{1,2})\.(\d{1,2})(?:\.(\d+))?',
-            
-            # 简化版本 (1.2, 2.0)
-            r'v?(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?',
-            
-            # Build版本 (Build 123, Build 1.2.3)
-            r'[Bb]uild\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
-            
-            # Release版本 (Release 1.0, R1.2.3)
-            r'[Rr]elease\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
-            
-            # 版本号前缀 (Version 1.2.3, Ver 1.0)
-            r'[Vv]er(?:sion)?\s+(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?',
-            
-            # 纯数字版本 (123, 2024)
-            r'^(\d+)$',
-            
-            # Chrome风格版本 (120.0.6099.109)
-            r'(\d+)\.(\d+)\.(\d+)\.(\d+)',
-            
-            # 日期版本 (20240315, 2024-03-15)
-            r'(\d{4})-?(\d{2})-?(\d{2})',
-            
-            # 特殊格式 (1.0-SNAPSHOT, 2.0.0.RELEASE)
-            r'(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?[-\.]([A-Z]+)',
-        ]
+        # 内置版本号模式（类级别共享）
+        self.builtin_patterns = list(self.BUILTIN_PATTERNS)
         
         # 合并自定义模式
         self.patterns = self.builtin_patterns[:]
         if custom_patterns:
             self.patterns.extend(custom_patterns)
         
-        # 编译正则表达式
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        # 编译正则表达式（相同模式在进程内只编译一次）
+        self.compiled_patterns = [_compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        
+        # 扫描整段页面文本用的模式，优先使用RE2
+        self.scan_patterns = [_compile_scan(pattern) for pattern in self.patterns]
+        
+        # 所有模式合并后的交替分支正则，解析时一次扫描定位命中的模式
+        self._combined, self._combined_groups = _build_combined(tuple(self.patterns), re.IGNORECASE)
+        
+        # 解析结果缓存，同一页面和版本列表中的版本字符串大量重复
+        self._parse_cached = functools.lru_cache(maxsize=4096)(self._parse)
+        
+        # Hyperscan预筛选库（可选），一次扫描找出在文本中有匹配的模式
+        self._prefilter_db = _build_prefilter_db(tuple(self.patterns))
+        self._prefilter_local = threading.local()
         
         self.logger.info(f"版本解析器初始化完成，共 {len(self.patterns)} 个模式")
     
@@ -99,15 +287,40 @@ class VersionParser:
         if not version_string:
             return None
         
+        return self._parse_cached(version_string)
+    
+    def _parse(self, version_string: str) -> VersionInfo:
+        """解析版本字符串（未缓存）"""
         # 清理版本字符串
         cleaned_version = self._clean_version_string(version_string)
         
-        # 尝试各种模式
-        for pattern in self.compiled_patterns:
+        start = 0
+        if self._combined is not None:
+            match = self._combined.search(cleaned_version)
+            if match is None:
+                # 没有任何模式能匹配
+                start = len(self.compiled_patterns)
+            else:
+                index, group_count = self._combined_groups[match.lastindex]
+                # 合并正则取最左匹配，靠前的模式在更靠后的位置匹配时以逐个模式扫描为准
+                if not any(pattern.search(cleaned_version, match.start() + 1)
+                           for pattern in self.compiled_patterns[:index]):
+                    groups = match.groups()[match.lastindex:match.lastindex + group_count]
+                    try:
+                        version_info = self._extract_version_info(groups, cleaned_version)
+                        if version_info:
+                            self.logger.debug("成功解析版本: %s -> %s", version_string, version_info)
+                            return version_info
+                    except Exception as e:
+                        self.logger.debug(f"解析版本失败: {version_string} - {str(e)}")
+                    start = index + 1
+        
+        # 逐个尝试剩余模式
+        for pattern in self.compiled_patterns[start:]:
             match = pattern.search(cleaned_version)
             if match:
                 try:
-                    version_info = self._extract_version_info(match, cleaned_version)
+                    version_info = self._extract_version_info(match.groups(), cleaned_version)
                     if version_info:
                         self.logger.debug(f"成功解析版本: {version_string} -> {version_info}")
                         return version_info
@@ -124,60 +337,23 @@ class VersionParser:
         # 移除多余的空白字符
         cleaned = version_string.strip()
         
-        # 移除常见的前缀和后缀
-        prefixes_to_remove = [
-            'version', 'ver', 'v', 'release', 'rel', 'r',
-            'build', 'b', '版本', '发布', '构建'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            pattern = rf'^{re.escape(prefix)}\s*[:\-]?\s*'
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # 按顺序移除常见的前缀（一次匹配完成）
+        cleaned = _PREFIX_RE.sub('', cleaned, count=1)
         
         # 移除括号内容（如果不包含数字）
-        cleaned = re.sub(r'\([^)]*\)', lambda m: m.group() if re.search(r'\d', m.group()) else '', cleaned)
+        cleaned = _PAREN_RE.sub(lambda m: m.group() if _DIGIT_RE.search(m.group()) else '', cleaned)
         
         # 移除多余的标点符号
-        cleaned = re.sub(r'[^\w\.\-\+]', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _PUNCT_RE.sub(' ', cleaned)
+        cleaned = _SPACES_RE.sub(' ', cleaned).strip()
         
         return cleaned
     
-    def _extract_version_info(self, match, original: str) -> Optional[VersionInfo]:
-        """从正则匹配中提取版本信息"""
-        groups = match.groups()
-        
-        # 过滤None值
-        groups = [g for g in groups if g is not None]
-        
-        if not groups:
-            return None
-        
-        version_info = VersionInfo(raw=original)
-        
+    def _extract_version_info(self, groups: Tuple[Optional[str], ...], original: str) -> Optional[VersionInfo]:
+        """从正则匹配的分组中提取版本信息"""
         try:
-            # 提取主要版本号组件
-            if len(groups) >= 1 and groups[0].isdigit():
-                version_info.major = int(groups[0])
-            
-            if len(groups) >= 2 and groups[1].isdigit():
-                version_info.minor = int(groups[1])
-            
-            if len(groups) >= 3 and groups[2].isdigit():
-                version_info.patch = int(groups[2])
-            
-            if len(groups) >= 4 and groups[3].isdigit():
-                version_info.build = int(groups[3])
-            
-            # 提取预发布信息
-            if len(groups) >= 5 and groups[4] and not groups[4].isdigit():
-                version_info.pre_release = groups[4]
-            
-            # 提取元数据
-            if len(groups) >= 6 and groups[5]:
-                version_info.metadata = groups[5]
-            
-            return version_info
+            components = _extract_version_components(groups)
+            return VersionInfo(original, *components) if components else None
             
         except (ValueError, IndexError) as e:
             self.logger.debug(f"提取版本信息失败: {str(e)}")
@@ -207,12 +383,12 @@ class VersionParser:
                 return 0
         
         # 比较版本号组件
-        t1 = v1.to_tuple()
-        t2 = v2.to_tuple()
+        k1 = v1.to_key()
+        k2 = v2.to_key()
         
-        if t1 < t2:
+        if k1 < k2:
             return -1
-        elif t1 > t2:
+        elif k1 > k2:
             return 1
         else:
             # 主版本号相同，比较预发布版本
@@ -300,6 +476,62 @@ class VersionParser:
         
         return normalized
     
+    def _candidate_patterns(self, text: str) -> List[int]:
+        """
+        获取在文本中可能有匹配的模式
+        
+        Args:
+            text: 文本内容
+            
+        Returns:
+            List[int]: 需要执行findall的模式序号
+        """
+        if self._prefilter_db is None:
+            return list(range(len(self.patterns)))
+        
+        # Scratch空间不能在线程间共享
+        scratch = getattr(self._prefilter_local, 'scratch', None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(self._prefilter_db)
+            self._prefilter_local.scratch = scratch
+        
+        matched_ids = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched_ids.add(pattern_id)
+        
+        try:
+            self._prefilter_db.scan(text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        except Exception as e:
+            self.logger.debug("Hyperscan扫描失败: %s", e)
+            return list(range(len(self.patterns)))
+        
+        # 预筛选允许误报但不会漏报，保持原有模式顺序
+        return sorted(matched_ids)
+    
+    def _findall_patterns(self, indices: List[int], text: str) -> Iterable[list]:
+        """
+        用每个模式对文本执行findall，大文本时多个模式并行执行
+        
+        Args:
+            indices: 模式序号列表
+            text: 文本内容
+            
+        Returns:
+            Iterable[list]: 与indices顺序一致的匹配结果
+        """
+        if len(text) >= PARALLEL_EXTRACT_MIN_SIZE and len(indices) > 1:
+            executor = _get_extract_executor()
+            if executor is not None:
+                try:
+                    # 传递模式字符串，由子进程自行编译（RE2对象不一定可序列化）
+                    patterns = [self.patterns[index] for index in indices]
+                    return list(executor.map(_findall, patterns, itertools.repeat(text, len(patterns))))
+                except Exception as e:
+                    self.logger.warning(f"并行提取版本号失败，改为串行: {str(e)}")
+        
+        return (self.scan_patterns[index].findall(text) for index in indices)
+    
     def extract_versions_from_text(self, text: str) -> List[str]:
         """
         从文本中提取所有可能的版本号
@@ -310,28 +542,40 @@ class VersionParser:
         Returns:
             List[str]: 版本号列表
         """
-        versions = []
+        # 版本号 -> 排序键，按首次出现的顺序保存（即保序去重）
+        sort_keys = {}
         
-        for pattern in self.compiled_patterns:
-            matches = pattern.findall(text)
+        for matches in self._findall_patterns(self._candidate_patterns(text), text):
             for match in matches:
                 if isinstance(match, tuple):
                     # 重构完整的版本字符串
-                    version_parts = [str(part) for part in match if part and str(part).isdigit()]
+                    version_parts = [part for part in match if part and part.isdigit()]
                     if version_parts:
                         version = '.'.join(version_parts)
-                        if self.is_valid_version(version):
-                            versions.append(version)
+                        if version in sort_keys:
+                            continue
+                        if all(part.isdecimal() for part in version_parts):
+                            # 纯数字点分串解析后即为前四段数值，直接计算，无需重新解析
+                            numbers = [int(part) for part in version_parts[:4]]
+                            if any(numbers):
+                                sort_keys[version] = _pack_key(*numbers)
+                        elif self.is_valid_version(version):
+                            sort_keys[version] = self._sort_key(version)
                 else:
-                    if self.is_valid_version(match):
-                        versions.append(match)
+                    if match not in sort_keys and self.is_valid_version(match):
+                        sort_keys[match] = self._sort_key(match)
         
-        # 去重并排序
-        unique_versions = list(set(versions))
-        unique_versions.sort(key=lambda v: self.parse(v).to_tuple() if self.parse(v) else (0, 0, 0, 0), reverse=True)
+        # 相同排序键的版本保持出现顺序
+        unique_versions = list(sort_keys)
+        unique_versions.sort(key=sort_keys.__getitem__, reverse=True)
         
         return unique_versions
     
+    def _sort_key(self, version_string: str) -> int:
+        """版本排序键，每个版本只解析一次"""
+        version_info = self.parse(version_string)
+        return version_info.to_key() if version_info else 0
+    
     def get_latest_version(self, versions: List[str]) -> Optional[str]:
         """
         从版本列表中获取最新版本
@@ -348,9 +592,10 @@ class VersionParser:
         if len(versions) == 1:
             return versions[0]
         
-        latest = versions[0]
-        for version in versions[1:]:
-            if self.is_newer(version, latest):
-                latest = version
+        # 每个版本只解析一次并算好比较键，再线性取最大值（预发布版本小于同号正式版本）
+        keyed = [((info.to_key(), not info.pre_release, info.pre_release), version)
+                 for version, info in zip(versions, map(self.parse, versions)) if info]
+        if not keyed:
+            return None
         
-        return latest
\ No newline at end of file
+        return max(keyed, key=itemgetter(0))[1]
\ No newline at end of file
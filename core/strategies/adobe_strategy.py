@@ -5,9 +5,18 @@
 Adobe策略 - 专门处理Adobe产品的版本检测
 """
 
-import re
 from typing import Dict, List
 from .base_strategy import BaseStrategy
+from utils.regex_utils import compile_scan_pattern
+
+
+# Adobe产品通常使用年份版本
+_ADOBE_PATTERNS = (
+    compile_scan_pattern(r'(\d{4})'),       # 年份版本如2024
+    compile_scan_pattern(r'CC\s+(\d{4})'),  # Creative Cloud 2024
+    compile_scan_pattern(r'(\d+\.\d+)'),    # 版本号如24.0
+)
+_ADOBE_YEAR_RE = compile_scan_pattern(r'20(\d{2})')
 
 
 class AdobeStrategy(BaseStrategy):
@@ -19,7 +28,7 @@ class AdobeStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为Adobe相关URL"""
-        return 'adobe.com' in software_info.url.lower()
+        return 'adobe.com' in self._url_lower(software_info)
     
     def get_priority(self, software_info) -> int:
         """Adobe策略优先级"""
@@ -48,52 +57,50 @@ class AdobeStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测Adobe产品版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Adobe页面'
                 }
             
-            # Adobe产品通常使用年份版本
-            version_patterns = [
-                r'(\d{4})',  # 年份版本如2024
-                r'CC\s+(\d{4})',  # Creative Cloud 2024
-                r'(\d+\.\d+)',  # 版本号如24.0
-            ]
-            
-            page_text = soup.get_text()
-            
-            # 特殊处理Creative Cloud
-            if 'creative cloud' in page_text.lower():
-                # 查找年份
-                year_match = re.search(r'20(\d{2})', page_text)
-                if year_match:
-                    year = f"20{year_match.group(1)}"
-                    return {
-                        'success': True,
-                        'version': f"CC {year}",
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'adobe_cc'
-                    }
+            # 特殊处理Creative Cloud：关键词在整页任意位置出现都优先于普通版本号。
+            # 版本元素中已有关键词和年份时即可确定，否则需要整页文本判断（只提取一次）
+            region_text = self._version_region_text(soup)
+            page_text = None
+            year_match = self._creative_cloud_year(region_text)
+            if year_match is None:
+                page_text = soup.get_text()
+                year_match = self._creative_cloud_year(page_text)
+            if year_match:
+                year = f"20{year_match.group(1)}"
+                return {
+                    'success': True,
+                    'version': f"CC {year}",
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'adobe_cc'
+                }
             
-            # 查找版本号
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'adobe_web'
-                    }
+            # 查找版本号，先候选元素后整页
+            for text in (region_text, page_text):
+                if not text:
+                    continue
+                for pattern in _ADOBE_PATTERNS:
+                    match = pattern.search(text)
+                    if match:
+                        version = match.group(1)
+                        return {
+                            'success': True,
+                            'version': version,
+                            'download_url': url,
+                            'release_date': None,
+                            'file_size': None,
+                            'checksum': None,
+                            'source': 'adobe_web'
+                        }
             
             return {
                 'success': False,
@@ -106,6 +113,13 @@ class AdobeStrategy(BaseStrategy):
                 'error': str(e)
             }
     
+    @staticmethod
+    def _creative_cloud_year(text: str):
+        """文本提到Creative Cloud时查找其中的年份，未提到或无年份时返回None"""
+        if text and 'creative cloud' in text.lower():
+            return _ADOBE_YEAR_RE.search(text)
+        return None
+    
     def get_supported_software(self) -> List[Dict]:
         """获取支持的软件列表"""
         return [
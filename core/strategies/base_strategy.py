@@ -5,8 +5,10 @@
 策略基类
 """
 
+import functools
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Iterable, Iterator, Optional, Pattern, Match
 
 import sys
 import os
@@ -14,15 +16,72 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from utils.logger import get_logger
 
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+
+# 版本信息通常所在的元素，优先只扫描这些元素的文本
+VERSION_TEXT_SELECTOR = 'h1, h2, .version, .release-version, [class*=version]'
+
+# 页面解析结果的缓存容量和生存时间（秒），同一页面在多个软件/重试间复用
+PAGE_CACHE_SIZE = 128
+PAGE_CACHE_TTL = 300
+
+
+@functools.lru_cache(maxsize=1024)
+def _lower_url(url: str) -> str:
+    """URL转小写（结果缓存，所有策略的can_handle/get_priority共用）"""
+    return url.lower()
+
 
 class BaseStrategy(ABC):
     """策略基类"""
     
+    # 所有策略共享的页面缓存（cachetools不可用时不缓存）
+    _page_cache = TTLCache(maxsize=PAGE_CACHE_SIZE, ttl=PAGE_CACHE_TTL) if TTLCache else None
+    _page_cache_lock = threading.Lock()
+    
+    @classmethod
+    def configure_page_cache(cls, maxsize: int = PAGE_CACHE_SIZE, ttl: float = PAGE_CACHE_TTL):
+        """
+        调整所有策略共享的页面缓存
+        
+        Args:
+            maxsize: 最多缓存的页面数，为0时关闭缓存
+            ttl: 页面生存时间（秒）
+        """
+        if TTLCache is None:
+            return
+        
+        with cls._page_cache_lock:
+            cache = BaseStrategy._page_cache
+            # 参数未变化时保留已缓存的页面
+            if cache is not None and cache.maxsize == maxsize and cache.ttl == ttl:
+                return
+            BaseStrategy._page_cache = TTLCache(maxsize=maxsize, ttl=ttl) if maxsize > 0 else None
+    
     def __init__(self, name: str):
         self.name = name
         self.logger = get_logger(f"strategy.{name}")
         self.success_count = 0
         self.failure_count = 0
+        # 策略实例在检测线程池中共享，计数需加锁
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def _url_lower(software_info) -> str:
+        """
+        获取软件URL的小写形式
+        
+        Args:
+            software_info: 软件信息
+            
+        Returns:
+            str: 小写URL
+        """
+        return _lower_url(software_info.url)
     
     @abstractmethod
     def can_handle(self, software_info) -> bool:
@@ -63,22 +122,183 @@ class BaseStrategy(ABC):
         """
         return 0
     
+    def _get_soup(self, url: str, web_scraper, parse_only=None):
+        """
+        获取页面的BeautifulSoup对象，短时间内重复请求同一URL时复用解析结果
+        
+        Args:
+            url: 页面URL
+            web_scraper: 网页爬虫适配器
+            parse_only: 只构建匹配子树的SoupStrainer（须为模块级常量），为None时构建完整文档树
+            
+        Returns:
+            Optional[BeautifulSoup]: BeautifulSoup对象，获取失败时为None（不缓存）
+        """
+        cache = self._page_cache
+        if cache is None:
+            return web_scraper.get_soup(url, parse_only=parse_only)
+        
+        # 部分解析的文档树不能给需要完整页面的策略复用，按strainer区分缓存
+        key = url if parse_only is None else ('strained', url, id(parse_only))
+        with self._page_cache_lock:
+            soup = cache.get(key)
+            raw = cache.get(('raw', url))
+        if soup is not None:
+            self.logger.debug("页面缓存命中: %s", url)
+            return soup
+        
+        # 已经取过原始字节时直接解析，不再重复请求
+        if raw is not None:
+            soup = web_scraper.parse_html(raw, url=url, parse_only=parse_only)
+        else:
+            soup = web_scraper.get_soup(url, parse_only=parse_only)
+        if soup is not None:
+            with self._page_cache_lock:
+                cache[key] = soup
+        return soup
+    
+    def _get_raw(self, url: str, web_scraper) -> Optional[bytes]:
+        """
+        获取页面原始字节，与_get_soup共用页面缓存
+        
+        Args:
+            url: 页面URL
+            web_scraper: 网页爬虫适配器
+            
+        Returns:
+            Optional[bytes]: 页面原始字节，获取失败时为None（不缓存）
+        """
+        cache = self._page_cache
+        if cache is None:
+            return web_scraper.get_raw(url)
+        
+        key = ('raw', url)
+        with self._page_cache_lock:
+            raw = cache.get(key)
+        if raw is not None:
+            return raw
+        
+        raw = web_scraper.get_raw(url)
+        if raw is not None:
+            with self._page_cache_lock:
+                cache[key] = raw
+        return raw
+    
+    @staticmethod
+    def _version_region_text(soup) -> str:
+        """
+        获取版本信息候选元素的文本
+        
+        Args:
+            soup: BeautifulSoup对象
+            
+        Returns:
+            str: 候选元素文本（每个元素一行），没有候选元素时为空字符串
+        """
+        return '\n'.join(element.get_text(' ', strip=True) for element in soup.select(VERSION_TEXT_SELECTOR))
+    
+    @classmethod
+    def _iter_page_texts(cls, soup) -> Iterator[str]:
+        """
+        依次产出候选元素文本和整页文本
+        
+        Args:
+            soup: BeautifulSoup对象
+            
+        Returns:
+            Iterator[str]: 待匹配文本，候选元素未命中时才遍历整个DOM
+        """
+        region_text = cls._version_region_text(soup)
+        if region_text:
+            yield region_text
+        yield soup.get_text()
+    
+    def _search_page(self, soup, patterns: Iterable[Pattern]) -> Optional[Match]:
+        """
+        按顺序用模式匹配页面文本
+        
+        Args:
+            soup: BeautifulSoup对象
+            patterns: 预编译正则列表
+            
+        Returns:
+            Optional[Match]: 第一个匹配结果
+        """
+        for page_text in self._iter_page_texts(soup):
+            for pattern in patterns:
+                match = pattern.search(page_text)
+                if match:
+                    return match
+        return None
+    
+    @staticmethod
+    def _priority_search(union_re: Pattern, text: str) -> Optional[Match]:
+        """
+        一遍扫描文本，按分组优先级选取匹配
+        
+        union_re的每个分支恰有一个捕获分组，分组编号即优先级（1最高）。
+        结果与按优先级依次对整段文本search相同：编号小的分组在任意位置命中都优先于编号大的。
+        分支消耗的文本不能遮住更高优先级分组的起点，必要时把捕获放在前瞻中。
+        
+        Args:
+            union_re: 合并后的正则
+            text: 待匹配文本
+            
+        Returns:
+            Optional[Match]: 优先级最高分组的第一个匹配，用match.group(match.lastindex)取值
+        """
+        first_matches = {}
+        for match in union_re.finditer(text):
+            kind = match.lastindex
+            if kind == 1:
+                return match
+            if kind not in first_matches:
+                first_matches[kind] = match
+        return first_matches[min(first_matches)] if first_matches else None
+    
+    def _search_page_priority(self, soup, union_re: Pattern, region_max_group: int = None) -> Optional[Match]:
+        """
+        用合并后的正则匹配页面文本，先候选元素后整页
+        
+        Args:
+            soup: BeautifulSoup对象
+            union_re: 合并后的正则，见_priority_search
+            region_max_group: 候选元素中只接受分组编号不大于该值的匹配，否则继续匹配整页；
+                为1时结果与直接匹配整页相同（高优先级分组在整页任意位置都优先）
+            
+        Returns:
+            Optional[Match]: 优先级最高分组的第一个匹配
+        """
+        match = None
+        for page_text in self._iter_page_texts(soup):
+            match = self._priority_search(union_re, page_text)
+            if match and (region_max_group is None or match.lastindex <= region_max_group):
+                return match
+        # 整页文本最后产出，其匹配不受region_max_group限制
+        return match
+    
     def record_success(self):
         """记录成功"""
-        self.success_count += 1
+        with self._stats_lock:
+            self.success_count += 1
     
     def record_failure(self):
         """记录失败"""
-        self.failure_count += 1
+        with self._stats_lock:
+            self.failure_count += 1
     
     def get_stats(self) -> Dict:
         """获取统计信息"""
-        total = self.success_count + self.failure_count
-        success_rate = (self.success_count / total * 100) if total > 0 else 0
+        # 一次读取两个计数，保证成功率与计数一致
+        with self._stats_lock:
+            success_count, failure_count = self.success_count, self.failure_count
+        
+        total = success_count + failure_count
+        success_rate = (success_count / total * 100) if total > 0 else 0
         
         return {
             'name': self.name,
-            'success_count': self.success_count,
-            'failure_count': self.failure_count,
+            'success_count': success_count,
+            'failure_count': failure_count,
             'success_rate': round(success_rate, 2)
         }
\ No newline at end of file
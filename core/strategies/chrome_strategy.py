@@ -8,6 +8,17 @@ Chrome策略 - 专门处理Chrome浏览器的版本检测
 import re
 from typing import Dict, List
 from .base_strategy import BaseStrategy
+from utils.regex_utils import compile_scan_pattern
+
+
+# 网页版本号模式，多个前缀合并为一个分支，页面只需扫描一遍
+_CHROME_RE = compile_scan_pattern(r'(?:Chrome|版本|Version)\s+(\d+\.\d+\.\d+\.\d+)', re.IGNORECASE)
+
+# 同一模式的字节版本，直接在原始HTML上匹配，命中时无需构建DOM
+_CHROME_RE_B = re.compile(
+    rb'(?:Chrome|' + '版本'.encode('utf-8') + rb'|Version)\s+(\d+\.\d+\.\d+\.\d+)',
+    re.IGNORECASE
+)
 
 
 class ChromeStrategy(BaseStrategy):
@@ -19,11 +30,13 @@ class ChromeStrategy(BaseStrategy):
             'google.com/chrome',
             'chrome.google.com'
         ]
+        # 所有域名合并为一个正则，一次扫描URL
+        self._domain_re = re.compile('|'.join(map(re.escape, self.supported_domains)))
     
     def can_handle(self, software_info) -> bool:
         """判断是否为Chrome相关URL"""
-        url = software_info.url.lower()
-        return any(domain in url for domain in self.supported_domains)
+        url = self._url_lower(software_info)
+        return self._domain_re.search(url) is not None
     
     def get_priority(self, software_info) -> int:
         """Chrome策略优先级"""
@@ -98,34 +111,31 @@ class ChromeStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测Chrome版本"""
         try:
-            soup = web_scraper.get_soup(url)
-            if not soup:
+            raw = self._get_raw(url, web_scraper)
+            if raw is None:
                 return {
                     'success': False,
                     'error': '无法获取Chrome页面'
                 }
             
-            # 查找版本信息
-            version_patterns = [
-                r'Chrome\s+(\d+\.\d+\.\d+\.\d+)',
-                r'版本\s+(\d+\.\d+\.\d+\.\d+)',
-                r'Version\s+(\d+\.\d+\.\d+\.\d+)',
-            ]
+            # 先在原始HTML上查找版本信息，前缀与版本号被标签隔开时再解析DOM
+            match = _CHROME_RE_B.search(raw)
+            version = match.group(1).decode('ascii') if match else None
+            if version is None:
+                soup = self._get_soup(url, web_scraper)
+                match = self._search_page(soup, (_CHROME_RE,)) if soup else None
+                version = match.group(1) if match else None
             
-            page_text = soup.get_text()
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'chrome_web'
-                    }
+            if version:
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'chrome_web'
+                }
             
             return {
                 'success': False,
@@ -5,9 +5,16 @@
 Firefox策略 - 专门处理Firefox浏览器的版本检测
 """
 
-import re
 from typing import Dict, List
 from .base_strategy import BaseStrategy
+from utils.regex_utils import compile_scan_pattern
+
+
+# 网页版本号模式
+_FIREFOX_PATTERNS = (
+    compile_scan_pattern(r'Firefox\s+(\d+\.\d+(?:\.\d+)?)'),  # Firefox 121.0 / Firefox 121.0.1
+    compile_scan_pattern(r'(\d+\.\d+\.\d+)'),                 # 121.0.1
+)
 
 
 class FirefoxStrategy(BaseStrategy):
@@ -19,7 +26,7 @@ class FirefoxStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为Firefox相关URL"""
-        url = software_info.url.lower()
+        url = self._url_lower(software_info)
         return 'mozilla.org' in url and 'firefox' in url
     
     def get_priority(self, software_info) -> int:
@@ -49,34 +56,25 @@ class FirefoxStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测Firefox版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Firefox页面'
                 }
             
-            # Firefox版本模式
-            version_patterns = [
-                r'Firefox\s+(\d+\.\d+)',  # Firefox 121.0
-                r'(\d+\.\d+\.\d+)',       # 121.0.1
-            ]
-            
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'firefox_web'
-                    }
+            match = self._search_page(soup, _FIREFOX_PATTERNS)
+            if match:
+                version = match.group(1)
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'firefox_web'
+                }
             
             return {
                 'success': False,
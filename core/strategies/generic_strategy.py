@@ -6,14 +6,94 @@
 """
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+from bs4 import BeautifulSoup
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from core.strategies.base_strategy import BaseStrategy
+from core.strategies.base_strategy import BaseStrategy, VERSION_TEXT_SELECTOR
+
+
+# HTML解析器：lxml为C实现，比纯Python的html.parser快数倍，未安装时回退
+_HTML_PARSER = 'lxml' if lxml is not None else 'html.parser'
+
+# 版本号匹配模式：标准版本号 1.2.3 或 1.2.3.4 优先，其次简化版本 1.2。
+# 年份版本（2024.1.0）、“版本：/version:”前缀、Build/Release前缀等写法匹配到的内容
+# 都是这两类的子集，按模式顺序总会先被它们命中，因此不再单独扫描
+_STD_VERSION_RE = re.compile(r'v?(?<!\d)(\d+\.\d+\.\d+(?:\.\d+)?)', re.IGNORECASE)
+_SHORT_VERSION_RE = re.compile(r'(?<!\d)(\d+\.\d+)')
+
+# 两类模式合并为一个正则，整页文本只扫描一遍
+_VERSION_UNION_RE = re.compile(r'v?(?<!\d)(?P<std>\d+\.\d+\.\d+(?:\.\d+)?)|(?<!\d)(?P<short>\d+\.\d+)', re.IGNORECASE)
+
+# 含版本号的文本节点
+_VERSION_TEXT_RE = re.compile(r'(?<!\d)\d+\.\d+')
+
+# 下载关键词
+_DOWNLOAD_KEYWORDS = (
+    'download', 'Download', 'DOWNLOAD',
+    '下载', '立即下载', 'Mac下载', '免费下载',
+    'dmg', 'pkg', 'zip', 'installer',
+    'get', 'Get', 'GET',
+    'install', 'Install', 'INSTALL',
+)
+_DOWNLOAD_KEYWORD_RES = tuple(re.compile(re.escape(keyword), re.IGNORECASE) for keyword in _DOWNLOAD_KEYWORDS)
+# 所有下载关键词合并的正则，用于快速排除不含任何关键词的链接
+_DOWNLOAD_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword in _DOWNLOAD_KEYWORDS), re.IGNORECASE)
+
+# Mac相关关键词
+_MAC_KEYWORDS = (
+    'mac', 'macos', 'osx', 'darwin',
+    'apple', 'macintosh',
+    '.dmg', '.pkg', '.app'
+)
+_MAC_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword in _MAC_KEYWORDS))
+
+# 安装包文件扩展名
+_DOWNLOAD_EXT_RE = re.compile('|'.join(re.escape(ext) for ext in ('.dmg', '.pkg', '.zip', '.tar.gz')))
+
+
+class _LexborLink:
+    """selectolax链接节点的包装，提供_extract_download_url用到的BeautifulSoup接口"""
+    
+    __slots__ = ('node', 'string')
+    
+    def __init__(self, node):
+        self.node = node
+        self.string = self._direct_string(node)
+    
+    @staticmethod
+    def _direct_string(node) -> Optional[str]:
+        """与Tag.string一致：只有唯一子节点时向下取其文本，否则为None"""
+        node = node.child
+        while node is not None and node.next is None:
+            if node.is_text_node:
+                return node.text_content
+            if node.is_comment_node:
+                return node.comment_content
+            node = node.child
+        return None
+    
+    def get(self, key: str, default=None):
+        value = self.node.attributes.get(key)
+        return default if value is None else value
+    
+    def get_text(self) -> str:
+        return self.node.text()
 
 
 class GenericStrategy(BaseStrategy):
@@ -21,33 +101,6 @@ class GenericStrategy(BaseStrategy):
     
     def __init__(self):
         super().__init__("generic")
-        
-        # 版本号匹配模式
-        self.version_patterns = [
-            r'v?(\d+\.\d+\.\d+(?:\.\d+)?)',  # 标准版本号 1.2.3 或 1.2.3.4
-            r'(\d{4}\.\d+\.\d+)',           # 年份版本 2024.1.0
-            r'版本\s*[：:]\s*(\d+\.\d+\.\d+)',  # 中文版本
-            r'version\s*[：:]\s*(\d+\.\d+\.\d+)',  # 英文版本
-            r'(\d+\.\d+)',                  # 简化版本 1.2
-            r'Build\s+(\d+\.\d+)',          # Build版本
-            r'Release\s+(\d+\.\d+)',        # Release版本
-        ]
-        
-        # 下载关键词
-        self.download_keywords = [
-            'download', 'Download', 'DOWNLOAD',
-            '下载', '立即下载', 'Mac下载', '免费下载',
-            'dmg', 'pkg', 'zip', 'installer',
-            'get', 'Get', 'GET',
-            'install', 'Install', 'INSTALL',
-        ]
-        
-        # Mac相关关键词
-        self.mac_keywords = [
-            'mac', 'macos', 'osx', 'darwin',
-            'apple', 'macintosh',
-            '.dmg', '.pkg', '.app'
-        ]
     
     def can_handle(self, software_info) -> bool:
         """通用策略可以处理任何软件"""
@@ -90,18 +143,21 @@ class GenericStrategy(BaseStrategy):
         """静态页面检测"""
         try:
             # 获取页面内容
-            soup = web_scraper.get_soup(software_info.url)
+            soup = self._get_soup(software_info.url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取页面内容'
                 }
             
+            # 链接列表只遍历DOM一次，供版本号和下载链接提取共用
+            anchors = soup.find_all('a', href=True)
+            
             # 提取版本号
-            version = self._extract_version_from_page(soup)
+            version = self._extract_version_from_page(soup, anchors=anchors)
             
             # 提取下载链接
-            download_url = self._extract_download_url(soup, software_info.url)
+            download_url = self._extract_download_url(soup, software_info.url, anchors)
             
             if version and version != "未找到版本信息":
                 return {
@@ -136,15 +192,23 @@ class GenericStrategy(BaseStrategy):
                     'error': '无法获取动态页面内容'
                 }
             
-            # 解析页面内容
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # 渲染后的页面通常很大，优先用selectolax快速提取，未找到版本号时再完整解析
+            version = download_url = None
+            if LexborHTMLParser is not None:
+                version, download_url = self._extract_with_lexbor(page_source, software_info.url)
             
-            # 提取版本号
-            version = self._extract_version_from_page(soup)
-            
-            # 提取下载链接
-            download_url = self._extract_download_url(soup, software_info.url)
+            if version is None:
+                # 解析页面内容
+                soup = BeautifulSoup(page_source, _HTML_PARSER)
+                
+                # 链接列表只遍历DOM一次，供版本号和下载链接提取共用
+                anchors = soup.find_all('a', href=True)
+                
+                # 提取版本号
+                version = self._extract_version_from_page(soup, anchors=anchors)
+                
+                # 提取下载链接
+                download_url = self._extract_download_url(soup, software_info.url, anchors)
             
             if version and version != "未找到版本信息":
                 return {
@@ -168,114 +232,246 @@ class GenericStrategy(BaseStrategy):
                 'error': str(e)
             }
     
-    def _extract_version_from_page(self, soup) -> str:
-        """从页面中提取版本号"""
+    def _extract_with_lexbor(self, page_source: str, base_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        用selectolax从页面中提取版本号和下载链接
+        
+        只覆盖版本元素和整页文本两个阶段，脚本、注释中的版本号等后备查找仍交给BeautifulSoup
+        
+        Args:
+            page_source: 页面HTML
+            base_url: 页面URL
+            
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (版本号, 下载链接)，未找到版本号时均为None
+        """
+        tree = LexborHTMLParser(page_source)
+        # 链接的直接文本在移除脚本前确定（与Tag.string一致，可能取自唯一的子脚本）
+        anchors = [_LexborLink(node) for node in tree.css('a[href]')]
+        # 与BeautifulSoup的get_text一致，脚本和样式内容不算页面文本
+        tree.strip_tags(['script', 'style', 'template'])
+        
+        region_text = '\n'.join(node.text(separator=' ', strip=True) for node in tree.css(VERSION_TEXT_SELECTOR))
+        version = self._region_version(region_text)
+        if version is None:
+            version = self._page_text_version(tree.root.text() if tree.root is not None else '')
+        if version is None:
+            return None, None
+        
+        return version, self._extract_download_url(None, base_url, anchors)
+    
+    def _extract_version_from_page(self, soup, page_text: str = None, anchors: List = None) -> str:
+        """
+        从页面中提取版本号
+        
+        Args:
+            soup: BeautifulSoup对象
+            page_text: 已提取的页面文本，为None时从soup获取
+            anchors: 已提取的带href的链接列表，为None时从soup获取
+            
+        Returns:
+            str: 版本号
+        """
+        # 先只扫描版本信息所在的标题和版本元素，命中标准版本号即返回，避免提取整页文本
+        version = self._region_version(self._version_region_text(soup))
+        if version:
+            return version
+        
         # 获取页面所有文本
-        page_text = soup.get_text()
+        if page_text is None:
+            page_text = soup.get_text()
         
-        # 尝试各种版本号模式
-        for pattern in self.version_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            if matches:
-                # 返回最可能的版本号（通常是最长的或最新的）
-                if isinstance(matches[0], tuple):
-                    version = matches[0][0] if matches[0] else None
-                else:
-                    version = max(matches, key=len)
-                
-                if version and self._is_valid_version(version):
-                    self.logger.info(f"找到版本号: {version}")
-                    return version
+        version = self._page_text_version(page_text)
+        if version:
+            return version
         
-        # 从特定元素中查找版本号
-        version_elements = soup.find_all(text=re.compile(r'\d+\.\d+'))
+        # 从特定元素中查找版本号（整页文本不含脚本、注释等节点）
+        version_elements = soup.find_all(text=_VERSION_TEXT_RE)
         for element in version_elements:
-            for pattern in self.version_patterns:
-                match = re.search(pattern, element, re.IGNORECASE)
-                if match:
-                    version = match.group(1)
-                    if self._is_valid_version(version):
-                        self.logger.info(f"从元素找到版本号: {version}")
-                        return version
+            version = self._search_version(element)
+            if version and self._is_valid_version(version):
+                self.logger.info(f"从元素找到版本号: {version}")
+                return version
         
         # 从下载链接中查找版本号
-        download_links = soup.find_all('a', href=True)
-        for link in download_links:
-            href = link.get('href', '')
-            for pattern in self.version_patterns:
-                match = re.search(pattern, href, re.IGNORECASE)
-                if match:
-                    version = match.group(1)
-                    if self._is_valid_version(version):
-                        self.logger.info(f"从下载链接找到版本号: {version}")
-                        return version
+        if anchors is None:
+            anchors = soup.find_all('a', href=True)
+        for link in anchors:
+            version = self._search_version(link.get('href', ''))
+            if version and self._is_valid_version(version):
+                self.logger.info(f"从下载链接找到版本号: {version}")
+                return version
         
         return "未找到版本信息"
     
-    def _extract_download_url(self, soup, base_url: str) -> str:
-        """提取下载链接"""
-        # 查找包含下载关键词的链接
-        for keyword in self.download_keywords:
-            # 查找文本包含关键词的链接
-            links = soup.find_all('a', href=True, string=re.compile(keyword, re.I))
-            if links:
-                href = links[0].get('href')
-                return urljoin(base_url, href)
+    def _region_version(self, region_text: str) -> Optional[str]:
+        """
+        从版本元素文本中查找标准版本号
+        
+        Args:
+            region_text: 版本信息候选元素的文本
             
-            # 查找href包含关键词的链接
-            links = soup.find_all('a', href=re.compile(keyword, re.I))
-            if links:
-                href = links[0].get('href')
-                return urljoin(base_url, href)
+        Returns:
+            Optional[str]: 版本号，只有简化版本号时返回None（可能是产品或系统名称中的数字）
+        """
+        if region_text:
+            version, _ = self._pick_page_version(region_text)
+            if version and self._is_valid_version(version):
+                self.logger.info(f"从版本元素找到版本号: {version}")
+                return version
+        return None
+    
+    def _page_text_version(self, page_text: str) -> Optional[str]:
+        """
+        从整页文本中查找版本号
+        
+        Args:
+            page_text: 页面文本
+            
+        Returns:
+            Optional[str]: 最长的标准版本号，没有时取最长的简化版本号
+        """
+        std_version, short_version = self._pick_page_version(page_text)
+        version = std_version or short_version
+        if version and self._is_valid_version(version):
+            self.logger.info(f"找到版本号: {version}")
+            return version
+        return None
+    
+    @staticmethod
+    def _pick_page_version(text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        一遍扫描同时收集两类候选版本号
+        
+        Args:
+            text: 待扫描文本
+            
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (最长的标准版本号, 最长的简化版本号)，
+            找到标准版本号时不再收集简化版本号
+        """
+        std_version = short_version = None
+        for match in _VERSION_UNION_RE.finditer(text):
+            std_version = match.group('std')
+            if std_version is not None:
+                # 出现标准版本号后简化版本号不再需要，剩余文本只扫描标准版本号
+                for std_match in _STD_VERSION_RE.finditer(text, match.end()):
+                    version = std_match.group(1)
+                    if len(version) > len(std_version):
+                        std_version = version
+                return std_version, short_version
+            
+            version = match.group('short')
+            if short_version is None or len(version) > len(short_version):
+                short_version = version
+        return None, short_version
+    
+    @staticmethod
+    def _search_version(text: str):
+        """查找文本中第一个标准版本号，没有时取第一个简化版本号"""
+        match = _STD_VERSION_RE.search(text) or _SHORT_VERSION_RE.search(text)
+        return match.group(1) if match else None
+    
+    def _extract_download_url(self, soup, base_url: str, anchors: List = None) -> str:
+        """
+        提取下载链接
         
-        # 查找Mac相关的下载链接
-        mac_links = soup.find_all('a', href=True)
-        for link in mac_links:
-            href = link.get('href', '').lower()
-            text = link.get_text().lower()
+        Args:
+            soup: BeautifulSoup对象
+            base_url: 页面URL
+            anchors: 已提取的带href的链接列表，为None时从soup获取
             
-            # 检查是否包含Mac关键词和文件扩展名
-            if any(keyword in (href + text) for keyword in self.mac_keywords):
-                return urljoin(base_url, link.get('href'))
+        Returns:
+            str: 下载链接
+        """
+        if anchors is None:
+            anchors = soup.find_all('a', href=True)
         
-        # 查找任何可能的下载链接
-        download_links = soup.find_all('a', href=True)
-        for link in download_links:
-            href = link.get('href', '').lower()
-            if any(ext in href for ext in ['.dmg', '.pkg', '.zip', '.tar.gz']):
-                return urljoin(base_url, link.get('href'))
+        # 只遍历一次链接，按原有优先级选取：
+        # 靠前的下载关键词优先（同一关键词先看链接文本再看href），其次Mac相关链接，最后安装包扩展名
+        best_rank = None
+        best_href = mac_href = ext_href = None
+        
+        for link in anchors:
+            href = link.get('href')
+            
+            rank = self._keyword_rank(link.string, href)
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best_rank, best_href = rank, href
+                if rank == 0:
+                    break
+            
+            # 已有关键词命中时不再需要后备结果
+            if best_href is None:
+                lowered_href = href.lower()
+                if mac_href is None and _MAC_KEYWORD_RE.search(lowered_href + link.get_text().lower()):
+                    mac_href = href
+                if ext_href is None and _DOWNLOAD_EXT_RE.search(lowered_href):
+                    ext_href = href
+        
+        for href in (best_href, mac_href, ext_href):
+            if href is not None:
+                return urljoin(base_url, href)
         
         return None
     
+    @staticmethod
+    def _keyword_rank(text, href: str):
+        """
+        计算链接的下载关键词优先级
+        
+        Args:
+            text: 链接的直接文本（tag.string，可能为None）
+            href: 链接地址
+            
+        Returns:
+            Optional[int]: 第i个关键词匹配文本为2i、匹配href为2i+1，未匹配返回None
+        """
+        rank = None
+        if text is not None and _DOWNLOAD_KEYWORD_RE.search(text):
+            rank = 2 * next(index for index, keyword_re in enumerate(_DOWNLOAD_KEYWORD_RES) if keyword_re.search(text))
+        
+        if _DOWNLOAD_KEYWORD_RE.search(href):
+            index = next(index for index, keyword_re in enumerate(_DOWNLOAD_KEYWORD_RES) if keyword_re.search(href))
+            if rank is None or 2 * index + 1 < rank:
+                rank = 2 * index + 1
+        
+        return rank
+    
     def _is_valid_version(self, version: str) -> bool:
-        """检查版本号是否有效"""
+        """检查版本号是否有效（点分隔的数字，含年份版本）"""
         if not version:
             return False
         
-        # 基本格式检查
-        if re.match(r'^\d+(\.\d+)*$', version):
-            return True
-        
-        # 年份格式检查
-        if re.match(r'^\d{4}\.\d+(\.\d+)*$', version):
-            return True
-        
-        # 检查是否过于简单（如单个数字）
-        if re.match(r'^\d+$', version) and len(version) < 2:
+        # 基本格式检查，首尾或连续的点会产生空段
+        parts = version.split('.')
+        if not all(part.isdigit() for part in parts):
             return False
         
-        return True
+        # 检查是否过于简单（如单个数字）
+        return len(parts) > 1 or len(version) > 1
     
-    def _find_download_page(self, base_url: str, web_scraper) -> str:
-        """查找下载页面"""
+    def _find_download_page(self, base_url: str, web_scraper, soup=None) -> str:
+        """
+        查找下载页面
+        
+        Args:
+            base_url: 页面URL
+            web_scraper: 网页爬虫适配器
+            soup: 已解析的base_url页面，为None时通过页面缓存获取
+            
+        Returns:
+            str: 下载页面URL，未找到时为base_url
+        """
         try:
-            soup = web_scraper.get_soup(base_url)
+            if soup is None:
+                soup = self._get_soup(base_url, web_scraper)
             if not soup:
                 return base_url
             
             # 查找下载页面链接
-            for keyword in self.download_keywords:
-                download_links = soup.find_all('a', href=True, string=re.compile(keyword, re.I))
+            for keyword_re in _DOWNLOAD_KEYWORD_RES:
+                download_links = soup.find_all('a', href=True, string=keyword_re)
                 for link in download_links:
                     full_url = urljoin(base_url, link['href'])
                     self.logger.info(f"找到潜在下载页面: {full_url}")
@@ -6,16 +6,65 @@ GitHub策略 - 专门处理GitHub项目的版本检测
 """
 
 import re
-import json
-from typing import Dict, List
-from urllib.parse import urlparse, urljoin
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 from datetime import datetime
 
+from bs4 import SoupStrainer
+
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from core.strategies.base_strategy import BaseStrategy
+from utils.json_utils import fast_loads
+
+
+# GitHub仓库URL：(owner, repo)，协议可省略
+_GITHUB_REPO_RE = re.compile(r'^(?:https?://)?[^/?#]*github\.com[^/?#]*/+([^/?#]+)/+([^/?#]+)', re.IGNORECASE)
+# GitHub Pages URL：取第一级子域名作为用户名
+_GITHUB_IO_RE = re.compile(r'^(?:https?://)?([^./?#]*)[^/?#]*github\.io', re.IGNORECASE)
+# Mac安装包资源名（已转小写）匹配
+_MAC_ASSET_RE = re.compile(r'mac|macos|darwin|osx|\.dmg|\.pkg')
+# 统计文件大小时使用的Mac资源关键词（不含osx）
+_MAC_SIZE_ASSET_RE = re.compile(r'mac|macos|darwin|\.dmg|\.pkg')
+# 网页中Mac下载链接（已转小写）匹配
+_MAC_LINK_RE = re.compile(r'\.dmg|\.pkg|mac|macos')
+# GitHub API请求头（只读，所有请求共用同一个字典）
+_GITHUB_API_HEADERS = {
+    'Accept': 'application/vnd.github.v3+json',
+    'User-Agent': 'MacSoftwareVersionTracker/1.0'
+}
+# releases页面只用到标题和链接，解析时只构建这些子树
+_RELEASES_PAGE_STRAINER = SoupStrainer(['a', 'h1', 'h2'])
+# 文件大小单位，每级1024倍
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+# tag名称中需要移除的前缀（长前缀优先）
+_TAG_PREFIXES = ('version', 'release', 'v', 'r')
+# tag版本号：标准版本号 | 简化版本号 | 纯数字版本
+_TAG_VERSION_RE = re.compile(r'(\d+\.\d+\.\d+(?:\.\d+)?)|(\d+\.\d+)|(\d+)')
+
+# Python 3.11起fromisoformat可直接解析"Z"后缀，无需先替换为"+00:00"
+try:
+    datetime.fromisoformat('1970-01-01T00:00:00Z')
+    _FROMISOFORMAT_ACCEPTS_Z = True
+except ValueError:
+    _FROMISOFORMAT_ACCEPTS_Z = False
+
+
+def _parse_github_timestamp(timestamp: str) -> datetime:
+    """
+    解析GitHub API的时间戳
+    
+    Args:
+        timestamp: ISO 8601时间，GitHub固定为"YYYY-MM-DDTHH:MM:SSZ"
+        
+    Returns:
+        datetime: 带UTC时区的时间
+    """
+    if _FROMISOFORMAT_ACCEPTS_Z:
+        return datetime.fromisoformat(timestamp)
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
 
 
 class GitHubStrategy(BaseStrategy):
@@ -31,7 +80,7 @@ class GitHubStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为GitHub项目"""
-        url = software_info.url.lower()
+        url = self._url_lower(software_info)
         
         # 检查是否包含github.com
         if 'github.com' in url:
@@ -45,9 +94,10 @@ class GitHubStrategy(BaseStrategy):
     
     def get_priority(self, software_info) -> int:
         """GitHub策略优先级较高"""
-        if 'github.com' in software_info.url.lower():
+        url = self._url_lower(software_info)
+        if 'github.com' in url:
             return 90
-        elif 'github.io' in software_info.url.lower():
+        elif 'github.io' in url:
             return 70
         return 0
     
@@ -91,26 +141,19 @@ class GitHubStrategy(BaseStrategy):
     def _parse_github_url(self, url: str) -> Dict:
         """解析GitHub URL获取仓库信息"""
         try:
-            # 标准化URL
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            
-            parsed = urlparse(url)
-            
             # 处理github.com URL
-            if 'github.com' in parsed.netloc:
-                path_parts = parsed.path.strip('/').split('/')
-                if len(path_parts) >= 2:
-                    return {
-                        'owner': path_parts[0],
-                        'repo': path_parts[1],
-                        'type': 'repository'
-                    }
+            match = _GITHUB_REPO_RE.match(url)
+            if match:
+                return {
+                    'owner': match.group(1),
+                    'repo': match.group(2),
+                    'type': 'repository'
+                }
             
-            # 处理github.io URL
-            elif 'github.io' in parsed.netloc:
-                # 从域名提取用户名
-                subdomain = parsed.netloc.split('.')[0]
+            # 处理github.io URL，从域名提取用户名
+            match = _GITHUB_IO_RE.match(url)
+            if match:
+                subdomain = match.group(1)
                 return {
                     'owner': subdomain,
                     'repo': subdomain + '.github.io',
@@ -130,29 +173,26 @@ class GitHubStrategy(BaseStrategy):
             api_url = f"{self.api_base}/repos/{repo_info['owner']}/{repo_info['repo']}/releases/latest"
             
             # 发送API请求
-            response = api_client.get(api_url, headers={
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'MacSoftwareVersionTracker/1.0'
-            })
+            response = api_client.get(api_url, headers=_GITHUB_API_HEADERS)
             
             if response.status_code == 200:
-                data = response.json()
+                data = fast_loads(response.content)
                 
                 # 解析版本信息
                 version = self._extract_version_from_tag(data.get('tag_name', ''))
-                download_url = self._find_mac_download_url(data.get('assets', []))
+                download_url, file_size = self._pick_mac_asset(data.get('assets', []))
                 
                 # 解析发布日期
                 release_date = None
                 if data.get('published_at'):
-                    release_date = datetime.fromisoformat(data['published_at'].replace('Z', '+00:00'))
+                    release_date = _parse_github_timestamp(data['published_at'])
                 
                 return {
                     'success': True,
                     'version': version,
                     'download_url': download_url or data.get('html_url'),
                     'release_date': release_date,
-                    'file_size': self._get_asset_size(data.get('assets', [])),
+                    'file_size': file_size,
                     'checksum': None,  # GitHub API不直接提供
                     'source': 'github_api'
                 }
@@ -179,13 +219,10 @@ class GitHubStrategy(BaseStrategy):
         try:
             api_url = f"{self.api_base}/repos/{repo_info['owner']}/{repo_info['repo']}/tags"
             
-            response = api_client.get(api_url, headers={
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'MacSoftwareVersionTracker/1.0'
-            })
+            response = api_client.get(api_url, headers=_GITHUB_API_HEADERS)
             
             if response.status_code == 200:
-                tags = response.json()
+                tags = fast_loads(response.content)
                 if tags:
                     # 获取最新的tag
                     latest_tag = tags[0]
@@ -218,7 +255,7 @@ class GitHubStrategy(BaseStrategy):
             # 构建releases页面URL
             releases_url = f"https://github.com/{repo_info['owner']}/{repo_info['repo']}/releases"
             
-            soup = web_scraper.get_soup(releases_url)
+            soup = self._get_soup(releases_url, web_scraper, parse_only=_RELEASES_PAGE_STRAINER)
             if not soup:
                 return {
                     'success': False,
@@ -265,57 +302,69 @@ class GitHubStrategy(BaseStrategy):
             return "未知版本"
         
         # 移除常见前缀
-        tag_name = re.sub(r'^(v|version|release|r)', '', tag_name, flags=re.IGNORECASE)
+        lowered = tag_name[:len('version')].lower()
+        for prefix in _TAG_PREFIXES:
+            if lowered.startswith(prefix):
+                tag_name = tag_name[len(prefix):]
+                break
         
-        # 匹配版本号模式
-        version_patterns = [
-            r'(\d+\.\d+\.\d+(?:\.\d+)?)',  # 标准版本号
-            r'(\d+\.\d+)',                 # 简化版本号
-            r'(\d{4}\.\d+\.\d+)',         # 年份版本
-            r'(\d+)',                      # 纯数字版本
-        ]
-        
-        for pattern in version_patterns:
-            match = re.search(pattern, tag_name)
-            if match:
+        # 优先级：标准版本号 > 简化版本号 > 纯数字版本（年份版本已被标准版本号覆盖）
+        short_version = number_version = None
+        for match in _TAG_VERSION_RE.finditer(tag_name):
+            kind = match.lastindex
+            if kind == 1:
                 return match.group(1)
+            if kind == 2:
+                if short_version is None:
+                    short_version = match.group(2)
+            elif number_version is None:
+                number_version = match.group(3)
         
         # 如果没有匹配到标准格式，返回原始tag名
-        return tag_name.strip()
+        return short_version or number_version or tag_name.strip()
     
-    def _find_mac_download_url(self, assets: List[Dict]) -> str:
-        """从assets中查找Mac下载链接"""
-        mac_keywords = ['mac', 'macos', 'darwin', 'osx', '.dmg', '.pkg']
+    def _pick_mac_asset(self, assets: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        一次遍历assets，同时找出Mac下载链接和文件大小
         
-        for asset in assets:
-            name = asset.get('name', '').lower()
-            if any(keyword in name for keyword in mac_keywords):
-                return asset.get('browser_download_url')
-        
-        # 如果没有找到Mac专用的，返回第一个asset
-        if assets:
-            return assets[0].get('browser_download_url')
+        Args:
+            assets: release的资源列表
+            
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (下载链接, 格式化后的文件大小)
+        """
+        mac_asset = None
+        file_size = None
         
-        return None
-    
-    def _get_asset_size(self, assets: List[Dict]) -> str:
-        """获取资源文件大小"""
         for asset in assets:
             name = asset.get('name', '').lower()
-            if any(keyword in name for keyword in ['mac', 'macos', 'darwin', '.dmg', '.pkg']):
+            
+            if mac_asset is None and _MAC_ASSET_RE.search(name):
+                mac_asset = asset
+            
+            if file_size is None and _MAC_SIZE_ASSET_RE.search(name):
                 size = asset.get('size', 0)
                 if size > 0:
-                    return self._format_file_size(size)
+                    file_size = self._format_file_size(size)
+            
+            if mac_asset is not None and file_size is not None:
+                break
         
-        return None
+        # 如果没有找到Mac专用的，返回第一个asset
+        if mac_asset is None and assets:
+            mac_asset = assets[0]
+        
+        download_url = mac_asset.get('browser_download_url') if mac_asset is not None else None
+        return download_url, file_size
     
     def _format_file_size(self, size_bytes: int) -> str:
         """格式化文件大小"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} B"
+        
+        # 按位长度直接确定单位，每级1024 = 2**10
+        unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
     
     def _find_download_link_in_page(self, soup, repo_info: Dict) -> str:
         """在页面中查找下载链接"""
@@ -324,7 +373,7 @@ class GitHubStrategy(BaseStrategy):
         
         for link in asset_links:
             href = link.get('href', '')
-            if any(keyword in href.lower() for keyword in ['.dmg', '.pkg', 'mac', 'macos']):
+            if _MAC_LINK_RE.search(href.lower()):
                 return urljoin('https://github.com', href)
         
         # 如果没有找到asset，返回源码下载链接
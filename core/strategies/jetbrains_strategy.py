@@ -10,6 +10,11 @@ from typing import Dict, List
 from .base_strategy import BaseStrategy
 
 
+# JetBrains版本模式合并为一个正则：2024.1.0 | 2024.1 | 版本 2024.1
+# “版本”分支的版本号放在前瞻中，不消耗数字，避免遮住其后的完整版本号
+_JETBRAINS_VERSION_RE = re.compile(r'(\d{4}\.\d+\.\d+)|(\d{4}\.\d+)|版本\s+(?=(\d+\.\d+))')
+
+
 class JetBrainsStrategy(BaseStrategy):
     """JetBrains产品版本检测策略"""
     
@@ -19,7 +24,7 @@ class JetBrainsStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为JetBrains相关URL"""
-        return 'jetbrains.com' in software_info.url.lower()
+        return 'jetbrains.com' in self._url_lower(software_info)
     
     def get_priority(self, software_info) -> int:
         """JetBrains策略优先级"""
@@ -48,35 +53,25 @@ class JetBrainsStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测JetBrains产品版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取JetBrains页面'
                 }
             
-            # JetBrains版本模式
-            version_patterns = [
-                r'(\d{4}\.\d+\.\d+)',  # 2024.1.0
-                r'(\d{4}\.\d+)',       # 2024.1
-                r'版本\s+(\d+\.\d+)',   # 版本 2024.1
-            ]
-            
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'jetbrains_web'
-                    }
+            match = self._search_page_priority(soup, _JETBRAINS_VERSION_RE)
+            if match:
+                version = match.group(match.lastindex)
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'jetbrains_web'
+                }
             
             return {
                 'success': False,
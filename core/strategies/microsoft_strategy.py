@@ -8,6 +8,34 @@ Microsoft策略 - 专门处理Microsoft产品的版本检测
 import re
 from typing import Dict, List
 from .base_strategy import BaseStrategy
+from utils.regex_utils import compile_scan_pattern
+
+
+# 各产品的版本模式合并为一个正则，整页文本只扫描一遍；分组编号即优先级（见BaseStrategy._priority_search）
+# 不含环视的模式可用RE2线性时间扫描（见compile_scan_pattern），含环视的模式仍用re
+
+# Office：订阅版名称（Microsoft 365 / Office 365）| Office 2021 | Microsoft 365 | 版本 16.0
+_OFFICE_VERSION_RE = compile_scan_pattern(
+    r'(microsoft 365|office 365)|Office\s+(\d{4})|(Microsoft\s+365)|版本\s+(\d+\.\d+)',
+    re.IGNORECASE
+)
+
+# Visual Studio：Visual Studio 2022 | VS 2022 | 版本 17.0.0
+_VS_VERSION_RE = compile_scan_pattern(r'Visual\s+Studio\s+(\d{4})|VS\s+(\d{4})|版本\s+(\d+\.\d+\.\d+)', re.IGNORECASE)
+
+# 通用：完整版本号 | 三段版本号 | 年份版本 | 中文版本
+# “版本”分支的版本号放在前瞻中，不消耗数字，避免遮住其后的完整版本号
+_GENERIC_VERSION_RE = re.compile(r'(?<!\d)(\d+\.\d+\.\d+\.\d+)|(?<!\d)(\d+\.\d+\.\d+)|(\d{4})|版本\s+(?=(\d+\.\d+))')
+# 通用模式中点分版本号（完整、三段）的分组编号上限
+_GENERIC_DOTTED_GROUPS = 2
+# 出现某类点分版本号后，剩余文本只需扫描该类及更高优先级的分组
+_GENERIC_NARROWED_RES = {
+    1: re.compile(r'(?<!\d)(\d+\.\d+\.\d+\.\d+)'),
+    2: re.compile(r'(?<!\d)(\d+\.\d+\.\d+\.\d+)|(?<!\d)(\d+\.\d+\.\d+)'),
+}
+# 不含点号的文本只可能匹配年份版本
+_YEAR_RE = compile_scan_pattern(r'(\d{4})')
+_GENERIC_YEAR_GROUP = 3
 
 
 class MicrosoftStrategy(BaseStrategy):
@@ -20,11 +48,13 @@ class MicrosoftStrategy(BaseStrategy):
             'office.com',
             'visualstudio.com'
         ]
+        # 所有域名合并为一个正则，一次扫描URL
+        self._domain_re = re.compile('|'.join(map(re.escape, self.supported_domains)))
     
     def can_handle(self, software_info) -> bool:
         """判断是否为Microsoft相关URL"""
-        url = software_info.url.lower()
-        return any(domain in url for domain in self.supported_domains)
+        url = self._url_lower(software_info)
+        return self._domain_re.search(url) is not None
     
     def get_priority(self, software_info) -> int:
         """Microsoft策略优先级"""
@@ -34,9 +64,10 @@ class MicrosoftStrategy(BaseStrategy):
         """检测Microsoft产品版本"""
         try:
             # 根据产品类型选择检测方法
-            if 'office' in software_info.url.lower() or 'microsoft-365' in software_info.url.lower():
+            url = self._url_lower(software_info)
+            if 'office' in url or 'microsoft-365' in url:
                 result = self._detect_office_version(software_info.url, adapters['web_scraper'])
-            elif 'visualstudio' in software_info.url.lower():
+            elif 'visualstudio' in url:
                 result = self._detect_vs_version(software_info.url, adapters['web_scraper'])
             else:
                 result = self._detect_generic_microsoft(software_info.url, adapters['web_scraper'])
@@ -59,27 +90,22 @@ class MicrosoftStrategy(BaseStrategy):
     def _detect_office_version(self, url: str, web_scraper) -> Dict:
         """检测Office版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Office页面'
                 }
             
-            # 查找版本信息的常见模式
-            version_patterns = [
-                r'Office\s+(\d{4})',  # Office 2021
-                r'Microsoft\s+365',   # Microsoft 365
-                r'版本\s+(\d+\.\d+)',  # 版本 16.0
-            ]
-            
-            page_text = soup.get_text()
-            
-            # 特殊处理Microsoft 365
-            if 'microsoft 365' in page_text.lower() or 'office 365' in page_text.lower():
+            # 先匹配标题和版本元素，未命中时才提取整页文本；
+            # 订阅版名称在整页任意位置出现都优先，版本元素中只接受该分组
+            match = self._search_page_priority(soup, _OFFICE_VERSION_RE, region_max_group=1)
+            if match:
+                # 特殊处理Microsoft 365
+                version = 'Microsoft 365' if match.lastindex == 1 else match.group(match.lastindex)
                 return {
                     'success': True,
-                    'version': 'Microsoft 365',
+                    'version': version,
                     'download_url': url,
                     'release_date': None,
                     'file_size': None,
@@ -87,21 +113,6 @@ class MicrosoftStrategy(BaseStrategy):
                     'source': 'microsoft_office'
                 }
             
-            # 查找具体版本号
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    version = match.group(1) if match.groups() else match.group(0)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'microsoft_office'
-                    }
-            
             return {
                 'success': False,
                 'error': '未找到Office版本信息'
@@ -116,35 +127,26 @@ class MicrosoftStrategy(BaseStrategy):
     def _detect_vs_version(self, url: str, web_scraper) -> Dict:
         """检测Visual Studio版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Visual Studio页面'
                 }
             
-            # Visual Studio版本模式
-            version_patterns = [
-                r'Visual\s+Studio\s+(\d{4})',  # Visual Studio 2022
-                r'VS\s+(\d{4})',               # VS 2022
-                r'版本\s+(\d+\.\d+\.\d+)',      # 版本 17.0.0
-            ]
-            
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'microsoft_vs'
-                    }
+            # 同上，“Visual Studio 2022”在整页任意位置出现都优先于“VS 2022”
+            match = self._search_page_priority(soup, _VS_VERSION_RE, region_max_group=1)
+            if match:
+                version = match.group(match.lastindex)
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'microsoft_vs'
+                }
             
             return {
                 'success': False,
@@ -160,37 +162,32 @@ class MicrosoftStrategy(BaseStrategy):
     def _detect_generic_microsoft(self, url: str, web_scraper) -> Dict:
         """检测通用Microsoft产品版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Microsoft页面'
                 }
             
-            # 通用版本模式
-            version_patterns = [
-                r'(\d+\.\d+\.\d+\.\d+)',  # 完整版本号
-                r'(\d+\.\d+\.\d+)',       # 三段版本号
-                r'(\d{4})',               # 年份版本
-                r'版本\s+(\d+\.\d+)',      # 中文版本
-            ]
+            # 每类模式只保留最长的候选，取优先级最高的一类（最可能的版本号）；
+            # 版本元素中只有年份或“版本”标注时不足以确定，继续扫描整页文本
+            longest = {}
+            for page_text in self._iter_page_texts(soup):
+                longest = self._longest_by_group(page_text)
+                if longest and min(longest) <= _GENERIC_DOTTED_GROUPS:
+                    break
             
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                matches = re.findall(pattern, page_text)
-                if matches:
-                    # 选择最可能的版本号（最长的）
-                    version = max(matches, key=len)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'microsoft_generic'
-                    }
+            if longest:
+                version = longest[min(longest)]
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'microsoft_generic'
+                }
             
             return {
                 'success': False,
@@ -203,6 +200,39 @@ class MicrosoftStrategy(BaseStrategy):
                 'error': str(e)
             }
     
+    @staticmethod
+    def _longest_by_group(page_text: str) -> Dict[int, str]:
+        """
+        一遍扫描收集通用版本模式每个分组最长的候选
+        
+        Args:
+            page_text: 页面文本
+            
+        Returns:
+            Dict[int, str]: 分组编号 -> 该分组最长（同长取最先出现）的匹配；
+            已出现点分版本号时不保证收集更低优先级的分组
+        """
+        if '.' not in page_text:
+            match = _YEAR_RE.search(page_text)
+            return {_GENERIC_YEAR_GROUP: match.group(1)} if match else {}
+        
+        longest = {}
+        regex, pos = _GENERIC_VERSION_RE, 0
+        while regex is not None:
+            current, regex = regex, None
+            for match in current.finditer(page_text, pos):
+                kind = match.lastindex
+                version = match.group(kind)
+                if kind not in longest or len(version) > len(longest[kind]):
+                    longest[kind] = version
+                
+                # 低优先级分组已不可能被选中，换用更窄的正则扫描剩余文本
+                narrowed = _GENERIC_NARROWED_RES.get(kind)
+                if narrowed is not None and narrowed.groups < current.groups:
+                    regex, pos = narrowed, match.end()
+                    break
+        return longest
+    
     def get_supported_software(self) -> List[Dict]:
         """获取支持的软件列表"""
         return [
@@ -7,10 +7,9 @@
 
 import re
 import logging
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Pattern, Tuple
 
-from .base_strategy import BaseStrategy
+from .base_strategy import BaseStrategy, PAGE_CACHE_SIZE, PAGE_CACHE_TTL
 from .github_strategy import GitHubStrategy
 from .chrome_strategy import ChromeStrategy
 from .microsoft_strategy import MicrosoftStrategy
@@ -24,7 +23,13 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from utils.logger import get_logger
+from utils.validators import parse_url
 
 
 class StrategyManager:
@@ -42,6 +47,13 @@ class StrategyManager:
         self.strategies: List[BaseStrategy] = []
         self.custom_strategies: Dict[str, BaseStrategy] = {}
         
+        # 策略共享的页面缓存：同一页面在多个策略、重试和批量检测间只请求和解析一次
+        page_cache_config = self.config.get('page_cache', {})
+        BaseStrategy.configure_page_cache(
+            page_cache_config.get('max_size', PAGE_CACHE_SIZE),
+            page_cache_config.get('ttl', PAGE_CACHE_TTL)
+        )
+        
         # 初始化内置策略
         self._initialize_builtin_strategies()
         
@@ -103,7 +115,7 @@ class StrategyManager:
         if hasattr(software_info, 'strategy_hint') and software_info.strategy_hint:
             strategy = self.custom_strategies.get(software_info.strategy_hint)
             if strategy and strategy.can_handle(software_info):
-                self.logger.debug(f"使用指定策略: {strategy.name}")
+                self.logger.debug("使用指定策略: %s", strategy.name)
                 return strategy
         
         # 找到所有能处理的策略
@@ -117,7 +129,7 @@ class StrategyManager:
             # 如果没有策略能处理，使用通用策略
             generic_strategy = next((s for s in self.strategies if s.name == 'generic'), None)
             if generic_strategy:
-                self.logger.warning(f"没有专用策略，使用通用策略: {software_info.name}")
+                self.logger.warning("没有专用策略，使用通用策略: %s", software_info.name)
                 return generic_strategy
             else:
                 raise Exception(f"没有可用的策略处理: {software_info.name}")
@@ -126,7 +138,7 @@ class StrategyManager:
         capable_strategies.sort(key=lambda x: x[1], reverse=True)
         selected_strategy = capable_strategies[0][0]
         
-        self.logger.debug(f"选择策略: {selected_strategy.name} for {software_info.name}")
+        self.logger.debug("选择策略: %s for %s", selected_strategy.name, software_info.name)
         return selected_strategy
     
     def register_strategy(self, name: str, strategy: BaseStrategy):
@@ -282,6 +294,90 @@ class StrategySelector:
             'word': 'microsoft',
             'excel': 'microsoft',
         }
+        
+        # 域名映射合并为一个正则
+        self._domain_re, self._domain_strategies = self._compile_mappings(self.domain_mappings)
+        
+        # 软件名称映射：优先用Aho-Corasick自动机一遍扫描，未安装pyahocorasick时用合并正则
+        self._name_automaton = self._build_automaton(self.name_mappings) if ahocorasick is not None else None
+        self._name_re, self._name_strategies = self._compile_mappings(self.name_mappings)
+    
+    @staticmethod
+    def _build_automaton(mappings: Dict[str, str]):
+        """
+        构建关键词的Aho-Corasick自动机
+        
+        Args:
+            mappings: 关键词 -> 策略名称
+            
+        Returns:
+            ahocorasick.Automaton: 值为(关键词在映射中的顺序, 策略名称)
+        """
+        automaton = ahocorasick.Automaton()
+        for index, (keyword, strategy_name) in enumerate(mappings.items()):
+            automaton.add_word(keyword, (index, strategy_name))
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_name(self, software_name_lower: str) -> Optional[str]:
+        """
+        查找软件名称中出现的、在映射中最靠前的关键词对应的策略
+        
+        Args:
+            software_name_lower: 小写软件名称
+            
+        Returns:
+            Optional[str]: 策略名称，没有关键词出现时为None
+        """
+        if self._name_automaton is None:
+            return self._match_mappings(self._name_re, self._name_strategies, software_name_lower)
+        
+        best = None
+        for _, (index, strategy_name) in self._name_automaton.iter(software_name_lower):
+            if best is None or index < best[0]:
+                best = (index, strategy_name)
+                if index == 0:
+                    break
+        return best[1] if best is not None else None
+    
+    @staticmethod
+    def _compile_mappings(mappings: Dict[str, str]) -> Tuple[Pattern, List[str]]:
+        """
+        把关键词映射合并为一个正则
+        
+        每个关键词是一个只含捕获分组的前瞻分支：不消耗字符，所有出现位置都会被扫描到，
+        分组编号即关键词在映射中的顺序
+        
+        Args:
+            mappings: 关键词 -> 策略名称
+            
+        Returns:
+            Tuple[Pattern, List[str]]: (合并后的正则, 按分组顺序排列的策略名称)
+        """
+        pattern = '|'.join(f'(?=({re.escape(keyword)}))' for keyword in mappings)
+        return re.compile(pattern), list(mappings.values())
+    
+    @staticmethod
+    def _match_mappings(mapping_re: Pattern, strategies: List[str], text: str) -> Optional[str]:
+        """
+        查找文本中出现的、在映射中最靠前的关键词对应的策略
+        
+        Args:
+            mapping_re: _compile_mappings生成的正则
+            strategies: 按分组顺序排列的策略名称
+            text: 待匹配文本
+            
+        Returns:
+            Optional[str]: 策略名称，没有关键词出现时为None
+        """
+        best = None
+        for match in mapping_re.finditer(text):
+            index = match.lastindex
+            if best is None or index < best:
+                best = index
+                if index == 1:
+                    break
+        return strategies[best - 1] if best is not None else None
     
     def auto_select_strategy(self, software_info) -> Optional[str]:
         """
@@ -295,20 +391,19 @@ class StrategySelector:
         """
         # 1. 检查域名映射
         try:
-            domain = urlparse(software_info.url).netloc.lower()
-            for domain_pattern, strategy_name in self.domain_mappings.items():
-                if domain_pattern in domain:
-                    self.logger.debug(f"根据域名选择策略: {domain} -> {strategy_name}")
-                    return strategy_name
+            domain = parse_url(software_info.url).netloc.lower()
+            strategy_name = self._match_mappings(self._domain_re, self._domain_strategies, domain)
+            if strategy_name:
+                self.logger.debug("根据域名选择策略: %s -> %s", domain, strategy_name)
+                return strategy_name
         except Exception as e:
             self.logger.warning(f"解析URL失败: {software_info.url} - {str(e)}")
         
         # 2. 检查软件名称映射
-        software_name_lower = software_info.name.lower()
-        for name_pattern, strategy_name in self.name_mappings.items():
-            if name_pattern in software_name_lower:
-                self.logger.debug(f"根据软件名称选择策略: {software_info.name} -> {strategy_name}")
-                return strategy_name
+        strategy_name = self._match_name(software_info.name.lower())
+        if strategy_name:
+            self.logger.debug("根据软件名称选择策略: %s -> %s", software_info.name, strategy_name)
+            return strategy_name
         
         # 3. 使用机器学习模型预测（可选）
         # predicted_strategy = self._ml_predict_strategy(software_info)
@@ -10,6 +10,11 @@ from typing import Dict, List
 from .base_strategy import BaseStrategy
 
 
+# VS Code版本模式合并为一个正则：1.85.0 | Version 1.85
+# “Version”分支的版本号放在前瞻中，不消耗数字，避免遮住其后的三段版本号
+_VSCODE_VERSION_RE = re.compile(r'(?<!\d)(\d+\.\d+\.\d+)|Version\s+(?=(\d+\.\d+))')
+
+
 class VSCodeStrategy(BaseStrategy):
     """VS Code版本检测策略"""
     
@@ -19,7 +24,7 @@ class VSCodeStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为VS Code相关URL"""
-        return 'code.visualstudio.com' in software_info.url.lower()
+        return 'code.visualstudio.com' in self._url_lower(software_info)
     
     def get_priority(self, software_info) -> int:
         """VS Code策略优先级"""
@@ -48,34 +53,25 @@ class VSCodeStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测VS Code版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取VS Code页面'
                 }
             
-            # VS Code版本模式
-            version_patterns = [
-                r'(\d+\.\d+\.\d+)',  # 1.85.0
-                r'Version\s+(\d+\.\d+)',  # Version 1.85
-            ]
-            
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'vscode_web'
-                    }
+            match = self._search_page_priority(soup, _VSCODE_VERSION_RE)
+            if match:
+                version = match.group(match.lastindex)
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'vscode_web'
+                }
             
             return {
                 'success': False,
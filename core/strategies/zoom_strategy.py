@@ -10,6 +10,11 @@ from typing import Dict, List
 from .base_strategy import BaseStrategy
 
 
+# Zoom版本模式合并为一个正则：5.16.10 | Version 5.16
+# “Version”分支的版本号放在前瞻中，不消耗数字，避免遮住其后的三段版本号
+_ZOOM_VERSION_RE = re.compile(r'(?<!\d)(\d+\.\d+\.\d+)|Version\s+(?=(\d+\.\d+))')
+
+
 class ZoomStrategy(BaseStrategy):
     """Zoom版本检测策略"""
     
@@ -19,7 +24,7 @@ class ZoomStrategy(BaseStrategy):
     
     def can_handle(self, software_info) -> bool:
         """判断是否为Zoom相关URL"""
-        return 'zoom.us' in software_info.url.lower()
+        return 'zoom.us' in self._url_lower(software_info)
     
     def get_priority(self, software_info) -> int:
         """Zoom策略优先级"""
@@ -48,34 +53,25 @@ class ZoomStrategy(BaseStrategy):
     def _detect_via_web(self, url: str, web_scraper) -> Dict:
         """通过网页检测Zoom版本"""
         try:
-            soup = web_scraper.get_soup(url)
+            soup = self._get_soup(url, web_scraper)
             if not soup:
                 return {
                     'success': False,
                     'error': '无法获取Zoom页面'
                 }
             
-            # Zoom版本模式
-            version_patterns = [
-                r'(\d+\.\d+\.\d+)',  # 5.16.10
-                r'Version\s+(\d+\.\d+)',  # Version 5.16
-            ]
-            
-            page_text = soup.get_text()
-            
-            for pattern in version_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    version = match.group(1)
-                    return {
-                        'success': True,
-                        'version': version,
-                        'download_url': url,
-                        'release_date': None,
-                        'file_size': None,
-                        'checksum': None,
-                        'source': 'zoom_web'
-                    }
+            match = self._search_page_priority(soup, _ZOOM_VERSION_RE)
+            if match:
+                version = match.group(match.lastindex)
+                return {
+                    'success': True,
+                    'version': version,
+                    'download_url': url,
+                    'release_date': None,
+                    'file_size': None,
+                    'checksum': None,
+                    'source': 'zoom_web'
+                }
             
             return {
                 'success': False,
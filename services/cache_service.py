@@ -8,7 +8,7 @@
 import time
 import pickle
 import hashlib
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 from abc import ABC, abstractmethod
 import threading
 
@@ -46,6 +46,10 @@ class CacheBackend(ABC):
     def exists(self, key: str) -> bool:
         """检查键是否存在"""
         pass
+    
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """批量获取缓存值，默认逐个读取"""
+        return [self.get(key) for key in keys]
 
 
 class MemoryCacheBackend(CacheBackend):
@@ -106,6 +110,11 @@ class MemoryCacheBackend(CacheBackend):
     def exists(self, key: str) -> bool:
         return self.get(key) is not None
     
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        # 只获取一次锁
+        with self.lock:
+            return [self.get(key) for key in keys]
+    
     def _evict_lru(self):
         """删除最久未访问的项"""
         if not self.access_times:
@@ -280,6 +289,32 @@ class CacheService:
             self.miss_count += 1
             return None
     
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        批量获取缓存值
+        
+        Args:
+            keys: 缓存键列表
+            
+        Returns:
+            List[Optional[Any]]: 与keys顺序一致的缓存值，未命中为None
+        """
+        if not keys:
+            return []
+        
+        try:
+            values = self.backend.get_many(keys)
+            hits = sum(1 for value in values if value is not None)
+            self.hit_count += hits
+            self.miss_count += len(values) - hits
+            self.logger.debug("批量获取缓存: %d/%d 命中", hits, len(values))
+            return values
+            
+        except Exception as e:
+            self.logger.error(f"批量获取缓存失败: {str(e)}")
+            self.miss_count += len(keys)
+            return [None] * len(keys)
+    
     def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """
         设置缓存值
@@ -13,6 +13,7 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 from core.detector import SoftwareVersionDetector, SoftwareInfo
+from core.parsers.version_parser import VersionParser
 from config.settings import load_config
 from utils.logger import setup_logging
 
@@ -164,6 +165,37 @@ def test_configuration():
         print(f"✗ 配置加载失败: {str(e)}")
 
 
+def test_version_prefixes():
+    """测试版本前缀移除（按前缀列表顺序，每个前缀最多移除一次）"""
+    print("\n" + "=" * 50)
+    print("测试版本前缀移除")
+    print("=" * 50)
+    
+    parser = VersionParser()
+    
+    # 版本字符串 -> (清理后的raw, major)
+    cases = {
+        'v1.2.3': ('1.2.3', 1),
+        'Version: 3.4': ('3.4', 3),
+        'build 12': ('12', 12),
+        'Release v2.0': ('v2.0', 2),  # 'v'排在'release'之前，移除'Release '后不再移除'v'
+        'RV5': ('V5', 0),             # 只移除'R'，'V5'无法解析
+        'Version v1.0': ('1.0', 1),   # 'version'和'v'按顺序各移除一次
+    }
+    
+    failures = 0
+    for version_string, (expected_raw, expected_major) in cases.items():
+        version_info = parser.parse(version_string)
+        if (version_info.raw, version_info.major) == (expected_raw, expected_major):
+            print(f"✓ {version_string!r} -> raw={version_info.raw!r}, major={version_info.major}")
+        else:
+            failures += 1
+            print(f"✗ {version_string!r} -> raw={version_info.raw!r}, major={version_info.major}，"
+                  f"期望 raw={expected_raw!r}, major={expected_major}")
+    
+    assert failures == 0, f"{failures} 个版本前缀用例失败"
+
+
 def main():
     """主函数"""
     print("Mac软件版本追踪器 - 系统测试")
@@ -173,6 +205,9 @@ def main():
         # 测试配置
         test_configuration()
         
+        # 测试版本前缀移除
+        test_version_prefixes()
+        
         # 测试策略选择
         test_strategy_selection()
         
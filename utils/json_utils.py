@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON编解码工具 - 优先使用orjson，未安装时回退到标准库json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def fast_loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    解析JSON数据
+    
+    Args:
+        data: JSON字节串或字符串
+        
+    Returns:
+        Any: 解析结果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fast_dumps(obj: Any) -> bytes:
+    """
+    序列化为UTF-8编码的JSON字节串
+    
+    Args:
+        obj: 待序列化对象
+        
+    Returns:
+        bytes: JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+正则工具 - 扫描页面文本的模式优先使用RE2线性时间引擎，未安装或语法不支持时回退到re
+"""
+
+import re
+from typing import Optional, Pattern
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# 模式中的转义、字符类边界和普通字符，用于把re的Unicode类改写为RE2语法
+_PATTERN_TOKEN_RE = re.compile(r'\\.|\[\^?\]?|\]|.', re.DOTALL)
+
+# re的\s对应str.isspace()，包括&nbsp;（U+00A0）、全角空格等；RE2的\s只匹配ASCII空白
+_RE2_SPACE_CLASS = r'\x{09}-\x{0d}\x{1c}-\x{20}\x{85}\p{Z}'
+
+# re的\d对应Unicode十进制数字（Nd）；RE2的\d只匹配ASCII数字
+_RE2_DIGIT_CLASS = r'\p{Nd}'
+
+# 语义与re不同且未改写的转义，含这些转义的模式不交给RE2
+_RE2_UNSUPPORTED_ESCAPES = frozenset(r'\S \D \w \W \b \B'.split())
+
+
+def _to_re2_pattern(pattern: str) -> Optional[str]:
+    """
+    把re模式中的\\s、\\d改写为与re语义相同的RE2字符类
+    
+    Args:
+        pattern: re正则表达式
+        
+    Returns:
+        Optional[str]: RE2正则表达式，含无法等价改写的转义时为None
+    """
+    parts = []
+    in_class = False
+    for token in _PATTERN_TOKEN_RE.findall(pattern):
+        if token in _RE2_UNSUPPORTED_ESCAPES:
+            return None
+        if token == r'\s':
+            token = _RE2_SPACE_CLASS if in_class else f'[{_RE2_SPACE_CLASS}]'
+        elif token == r'\d':
+            token = _RE2_DIGIT_CLASS
+        elif token[0] == '[' and not in_class:
+            in_class = True
+        elif token == ']' and in_class:
+            in_class = False
+        parts.append(token)
+    return ''.join(parts)
+
+
+def compile_scan_pattern(pattern: str, flags: int = 0) -> Pattern:
+    """
+    编译用于扫描页面文本的模式
+    
+    可用时使用RE2线性时间引擎，大页面上的扫描不会回溯；\\s、\\d改写为与re相同的
+    Unicode字符类（页面文本中常见&nbsp;）。RE2不支持的语法（如环视、反向引用）、
+    无法等价改写的转义或除IGNORECASE外的标志回退到re
+    
+    Args:
+        pattern: 正则表达式
+        flags: re标志，仅re.IGNORECASE可转换给RE2
+        
+    Returns:
+        Pattern: 预编译正则（RE2或re对象，search/finditer/lastindex用法一致）
+    """
+    if re2 is not None and not flags & ~re.IGNORECASE:
+        re2_pattern = _to_re2_pattern(pattern)
+        if re2_pattern is not None:
+            try:
+                return re2.compile(('(?i)' if flags else '') + re2_pattern)
+            except Exception:
+                pass
+    return re.compile(pattern, flags)
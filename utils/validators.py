@@ -6,8 +6,39 @@
 """
 
 import re
+import functools
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import urlparse, ParseResult
+
+
+# 预编译的校验正则
+_NAME_RE = re.compile(r'^[a-zA-Z0-9\s\-_\.\+\(\)]+$')
+_NETLOC_RE = re.compile(r'^[a-zA-Z0-9\-\.]+$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+# 常见版本号格式
+_VERSION_RES = (
+    re.compile(r'^\d+\.\d+\.\d+(\.\d+)?$'),  # 1.2.3 或 1.2.3.4
+    re.compile(r'^\d{4}\.\d+\.\d+$'),        # 2024.1.0
+    re.compile(r'^v?\d+\.\d+$'),             # v1.2 或 1.2
+    re.compile(r'^\d+$'),                    # 纯数字
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_url(url: str) -> ParseResult:
+    """
+    解析URL（结果缓存，供校验和策略选择共用）
+    
+    Args:
+        url: URL字符串
+        
+    Returns:
+        ParseResult: 解析结果
+    """
+    return urlparse(url)
 
 
 def validate_software_info(software_info) -> bool:
@@ -59,7 +90,7 @@ def validate_software_name(name: str) -> bool:
         return False
     
     # 检查是否包含有效字符
-    if not re.match(r'^[a-zA-Z0-9\s\-_\.\+\(\)]+$', name):
+    if not _NAME_RE.match(name):
         return False
     
     return True
@@ -83,14 +114,14 @@ def validate_url(url: str) -> bool:
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
-        parsed = urlparse(url)
+        parsed = parse_url(url)
         
         # 检查基本组件
         if not parsed.netloc:
             return False
         
         # 检查域名格式
-        if not re.match(r'^[a-zA-Z0-9\-\.]+$', parsed.netloc):
+        if not _NETLOC_RE.match(parsed.netloc):
             return False
         
         return True
@@ -112,19 +143,8 @@ def validate_version(version: str) -> bool:
     if not version or not isinstance(version, str):
         return False
     
-    # 常见版本号格式
-    version_patterns = [
-        r'^\d+\.\d+\.\d+(\.\d+)?$',  # 1.2.3 或 1.2.3.4
-        r'^\d{4}\.\d+\.\d+$',        # 2024.1.0
-        r'^v?\d+\.\d+$',             # v1.2 或 1.2
-        r'^\d+$',                    # 纯数字
-    ]
-    
-    for pattern in version_patterns:
-        if re.match(pattern, version.strip()):
-            return True
-    
-    return False
+    version = version.strip()
+    return any(pattern.match(version) for pattern in _VERSION_RES)
 
 
 def validate_email(email: str) -> bool:
@@ -140,8 +160,7 @@ def validate_email(email: str) -> bool:
     if not email or not isinstance(email, str):
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def sanitize_filename(filename: str) -> str:
@@ -158,10 +177,10 @@ def sanitize_filename(filename: str) -> str:
         return "unnamed"
     
     # 移除不安全字符
-    safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    safe_filename = _UNSAFE_FILENAME_RE.sub('_', filename)
     
     # 移除控制字符
-    safe_filename = re.sub(r'[\x00-\x1f\x7f]', '', safe_filename)
+    safe_filename = _CONTROL_CHARS_RE.sub('', safe_filename)
     
     # 限制长度
     if len(safe_filename) > 255: